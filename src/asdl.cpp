@@ -1,8 +1,9 @@
 #include "asdl.hpp"
-#include <fstream>
+#include <sstream>
 #include <stdexcept>
 #include <iostream>
 #include <cctype>  // for std::tolower
+#include <unordered_map>
 
 // --- Idiv ---
 Idiv::Idiv(std::unique_ptr<Operand> d) : dst(std::move(d)) {}
@@ -229,34 +230,47 @@ const std::vector<std::unique_ptr<Instruction>>& FunctionDefinition::getInstruct
 }
 
 std::string FunctionDefinition::toString() const {
-    std::string result = "FunctionDefinition(name=" + name + ", instructions=[\n";
+    std::ostringstream oss;
+    printTo(oss);
+    return oss.str();
+}
+
+void FunctionDefinition::printTo(std::ostream& os) const {
+    os << "FunctionDefinition(name=" << name << ", instructions=[\n";
     for (const auto& instr : instructions) {
-        result += "  " + instr->toString() + "\n";
+        os << "  ";
+        instr->printTo(os);
+        os << "\n";
     }
-    result += "])";
-    return result;
+    os << "])";
 }
 
 std::string FunctionDefinition::toASM() const {
-    std::string asmCode = ".globl _" + name + "\n_" + name + ":\n";
-    asmCode += "  pushq %rbp\n";
-    asmCode += "  movq %rsp, %rbp\n";
+    std::ostringstream oss;
+    writeASM(oss);
+    return oss.str();
+}
+
+void FunctionDefinition::writeASM(std::ostream& os) const {
+    os << ".globl _" << name << "\n_" << name << ":\n";
+    os << "  pushq %rbp\n";
+    os << "  movq %rsp, %rbp\n";
 
     for (const auto& instr : instructions) {
         if (dynamic_cast<Label*>(instr.get())) {
             // Saut de ligne avant le label
-            asmCode += "\n";
+            os << "\n";
             // Label sans indentation
-            asmCode += instr->toASM() + "\n";
+            instr->writeASM(os);
             // Saut de ligne après le label
-            asmCode += "\n";
+            os << "\n\n";
         } else {
             // Instruction classique avec indentation
-            asmCode += "  " + instr->toASM() + "\n";
+            os << "  ";
+            instr->writeASM(os);
+            os << "\n";
         }
     }
-
-    return asmCode;
 }
 
 // --- ASDLProgram ---
@@ -265,229 +279,235 @@ ASDLProgram::ASDLProgram(std::unique_ptr<FunctionDefinition> funcDef)
     : functionDefinition(std::move(funcDef)) {}
 
 std::string ASDLProgram::toString() const {
-    return "ASDLProgram(" + functionDefinition->toString() + ")";
+    std::ostringstream oss;
+    printTo(oss);
+    return oss.str();
+}
+
+void ASDLProgram::printTo(std::ostream& os) const {
+    os << "ASDLProgram(";
+    functionDefinition->printTo(os);
+    os << ")";
 }
 
 std::string ASDLProgram::toASM() const {
     return functionDefinition->toASM();
 }
 
+void ASDLProgram::writeASM(std::ostream& os) const {
+    functionDefinition->writeASM(os);
+}
+
 std::unique_ptr<Operand> convertValToOperand(const std::unique_ptr<tacky::Val>& val) {
-    if (auto c = dynamic_cast<const tacky::Constant*>(val.get())) {
-        return std::make_unique<Imm>(c->value);
-    } else if (auto v = dynamic_cast<const tacky::Var*>(val.get())) {
-        return std::make_unique<Pseudo>(v->name);
-    } else {
-        throw std::runtime_error("Unsupported tacky::Val type");
+    switch (val->kind) {
+        case tacky::ValKind::Constant:
+            return std::make_unique<Imm>(static_cast<const tacky::Constant*>(val.get())->value);
+        case tacky::ValKind::Var:
+            return std::make_unique<Pseudo>(static_cast<const tacky::Var*>(val.get())->name);
     }
+    throw std::runtime_error("Unsupported tacky::Val type");
 }
 
-// --- convertTackyToASDL
-ASDLProgram convertTackyToASDL(const tacky::Program& tackyProgram) {
-    std::vector<std::unique_ptr<Instruction>> asdlInstructions;
+using ASDLInstructions = std::vector<std::unique_ptr<Instruction>>;
 
-    for (const auto& instr : tackyProgram.function->body) {
-        // Handle Return
-        if (auto ret = dynamic_cast<const tacky::Return*>(instr.get())) {
-            if (auto c = dynamic_cast<const tacky::Constant*>(ret->value.get())) {
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Imm>(c->value),
-                    std::make_unique<Register>(Reg::AX)
-                ));
-            } else if (auto v = dynamic_cast<const tacky::Var*>(ret->value.get())) {
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Pseudo>(v->name),
-                    std::make_unique<Register>(Reg::AX)
-                ));
-            }
-            asdlInstructions.push_back(std::make_unique<Ret>());
-        }
+// --- Per-instruction conversions, selected by convertTackyToASDL ---
 
-        //Handle Jmp
-        else if (auto jmp = dynamic_cast<const tacky::Jump*>(instr.get())) {
-            asdlInstructions.push_back(std::make_unique<Jmp>(jmp->target));
-        }
+static void convertReturn(const tacky::Return& ret, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Mov>(
+        convertValToOperand(ret.value),
+        std::make_unique<Register>(Reg::AX)
+    ));
+    out.push_back(std::make_unique<Ret>());
+}
 
-        //Handle JmpIfZero
-        else if (auto jmpiz = dynamic_cast<const tacky::JumpIfZero*>(instr.get())) {
-            asdlInstructions.push_back(std::make_unique<Cmp>(
-                std::make_unique<Imm>(0),
-                convertValToOperand(jmpiz->condition)
-            ));
+static void convertJump(const tacky::Jump& jmp, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Jmp>(jmp.target));
+}
 
-            asdlInstructions.push_back(std::make_unique<JmpCC>(
-                CondNode::E,
-                jmpiz->target
-            ));
-        }
+static void convertJumpIfZero(const tacky::JumpIfZero& jmpiz, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Cmp>(
+        std::make_unique<Imm>(0),
+        convertValToOperand(jmpiz.condition)
+    ));
 
-        //Handle JmpIfNotZero
-        else if (auto jmpinz = dynamic_cast<const tacky::JumpIfNotZero*>(instr.get())) {
-            asdlInstructions.push_back(std::make_unique<Cmp>(
-                std::make_unique<Imm>(0),
-                convertValToOperand(jmpinz->condition)
-            ));
+    out.push_back(std::make_unique<JmpCC>(
+        CondNode::E,
+        jmpiz.target
+    ));
+}
 
-            asdlInstructions.push_back(std::make_unique<JmpCC>(
-                CondNode::NE,
-                jmpinz->target
-            ));
-        }
+static void convertJumpIfNotZero(const tacky::JumpIfNotZero& jmpinz, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Cmp>(
+        std::make_unique<Imm>(0),
+        convertValToOperand(jmpinz.condition)
+    ));
 
-        //Handle Copy
-        else if (auto copy = dynamic_cast<const tacky::Copy*>(instr.get())) {
-            asdlInstructions.push_back(std::make_unique<Mov>(
-                convertValToOperand(copy->src),
-                convertValToOperand(copy->dst)
-            ));
-        }
+    out.push_back(std::make_unique<JmpCC>(
+        CondNode::NE,
+        jmpinz.target
+    ));
+}
 
-        //Handle Label
-        else if (auto label = dynamic_cast<const tacky::Label*>(instr.get())) {
-            asdlInstructions.push_back(std::make_unique<Label>(
-                label->name
-            ));
+static void convertCopy(const tacky::Copy& copy, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Mov>(
+        convertValToOperand(copy.src),
+        convertValToOperand(copy.dst)
+    ));
+}
+
+static void convertLabel(const tacky::Label& label, ASDLInstructions& out) {
+    out.push_back(std::make_unique<Label>(
+        label.name
+    ));
+}
+
+static void convertUnary(const tacky::Unary& unary, ASDLInstructions& out) {
+    if (unary.op == tacky::UnaryOp::Not) {
+        out.push_back(std::make_unique<Cmp>(
+            std::make_unique<Imm>(0),
+            convertValToOperand(unary.src)
+        ));
+
+        out.push_back(std::make_unique<Mov>(
+            std::make_unique<Imm>(0),
+            convertValToOperand(unary.dst)
+        ));
+
+        out.push_back(std::make_unique<SetCC>(
+            CondNode::E,
+            convertValToOperand(unary.dst)
+        ));
+        return;
+    }
+
+    UnaryOperator op;
+    switch (unary.op) {
+        case tacky::UnaryOp::Complement: op = UnaryOperator::NOT; break;
+        case tacky::UnaryOp::Negate:     op = UnaryOperator::NEG; break;
+        default: throw std::runtime_error("Unknown UnaryOp");
+    }
+
+    // First: mov src, dst
+    out.push_back(std::make_unique<Mov>(
+        convertValToOperand(unary.src),
+        convertValToOperand(unary.dst)
+    ));
+
+    // Then: unary op dst
+    out.push_back(std::make_unique<Unary>(
+        op,
+        convertValToOperand(unary.dst)
+    ));
+}
+
+static void convertBinary(const tacky::Binary& binary, ASDLInstructions& out) {
+    auto src1 = convertValToOperand(binary.src1);
+    auto src2 = convertValToOperand(binary.src2);
+
+    if (binary.op == tacky::BinaryOp::DIVIDE || binary.op == tacky::BinaryOp::REMAINDER) {
+        // mov src1, %eax
+        out.push_back(std::make_unique<Mov>(
+            std::move(src1),
+            std::make_unique<Register>(Reg::AX)
+        ));
+
+        // cdq
+        out.push_back(std::make_unique<Cdq>());
+
+        // idiv src2
+        out.push_back(std::make_unique<Idiv>(
+            std::move(src2)
+        ));
+
+        // mov %eax or %edx -> dst
+        out.push_back(std::make_unique<Mov>(
+            std::make_unique<Register>(
+                binary.op == tacky::BinaryOp::DIVIDE ? Reg::AX : Reg::DX
+            ),
+            convertValToOperand(binary.dst)
+        ));
+    } else if (binary.op == tacky::BinaryOp::ADD || binary.op == tacky::BinaryOp::SUBTRACT || binary.op == tacky::BinaryOp::MULTIPLY) {
+        BinaryOperator op;
+        switch (binary.op) {
+            case tacky::BinaryOp::ADD:      op = BinaryOperator::ADD; break;
+            case tacky::BinaryOp::SUBTRACT: op = BinaryOperator::SUB; break;
+            case tacky::BinaryOp::MULTIPLY: op = BinaryOperator::MULT; break;
+            default: throw std::runtime_error("Unknown BinaryOp");
         }
 
-        // Handle Unary
-        else if (auto unary = dynamic_cast<const tacky::Unary*>(instr.get())) {
-            UnaryOperator op;
-
-            if (unary->op == tacky::UnaryOp::Not) {
-                asdlInstructions.push_back(std::make_unique<Cmp>(
-                    std::make_unique<Imm>(0),
-                    convertValToOperand(unary->src)
-                ));
-
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Imm>(0),
-                    convertValToOperand(unary->dst)
-                ));
-
-                asdlInstructions.push_back(std::make_unique<SetCC>(
-                    CondNode::E,
-                    convertValToOperand(unary->dst)
-                ));
-            } else {
-                switch (unary->op) {
-                    case tacky::UnaryOp::Complement: op = UnaryOperator::NOT; break;
-                    case tacky::UnaryOp::Negate:     op = UnaryOperator::NEG; break;
-                    default: throw std::runtime_error("Unknown UnaryOp");
-                }
-
-                std::unique_ptr<Operand> src;
-                if (auto c = dynamic_cast<const tacky::Constant*>(unary->src.get())) {
-                    src = std::make_unique<Imm>(c->value);
-                } else if (auto v = dynamic_cast<const tacky::Var*>(unary->src.get())) {
-                    src = std::make_unique<Pseudo>(v->name);
-                }
-
-                std::string dstName = dynamic_cast<const tacky::Var*>(unary->dst.get())->name;
-                auto dst = std::make_unique<Pseudo>(dstName);
-
-                // First: mov src, dst
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::move(src),
-                    std::make_unique<Pseudo>(dst->getIdentifier())
-                ));
-
-                // Then: unary op dst
-                asdlInstructions.push_back(std::make_unique<Unary>(
-                    op,
-                    std::move(dst)
-                ));
-            }
+        // mov src1, dst
+        out.push_back(std::make_unique<Mov>(
+            std::move(src1),
+            convertValToOperand(binary.dst)
+        ));
+
+        // op src2, dst
+        out.push_back(std::make_unique<Binary>(
+            op,
+            std::move(src2),
+            convertValToOperand(binary.dst)
+        ));
+    } else {
+        CondNode op;
+        switch (binary.op) {
+            case tacky::BinaryOp::EQUAL:       op = CondNode::E; break;
+            case tacky::BinaryOp::NOTEQUAL:    op = CondNode::NE; break;
+            case tacky::BinaryOp::LESSTHAN:    op = CondNode::L; break;
+            case tacky::BinaryOp::LESSEQ:      op = CondNode::LE; break;
+            case tacky::BinaryOp::GREATERTHAN: op = CondNode::G; break;
+            case tacky::BinaryOp::GREATEREQ:   op = CondNode::GE; break;
+            default: throw std::runtime_error("Unknown RelationOp in BinaryOp");
         }
 
-        // Handle Binary
-        else if (auto binary = dynamic_cast<const tacky::Binary*>(instr.get())) {
-            std::unique_ptr<Operand> src1;
-            if (auto c = dynamic_cast<const tacky::Constant*>(binary->src1.get())) {
-                src1 = std::make_unique<Imm>(c->value);
-            } else if (auto v = dynamic_cast<const tacky::Var*>(binary->src1.get())) {
-                src1 = std::make_unique<Pseudo>(v->name);
-            }
-
-            std::unique_ptr<Operand> src2;
-            if (auto c = dynamic_cast<const tacky::Constant*>(binary->src2.get())) {
-                src2 = std::make_unique<Imm>(c->value);
-            } else if (auto v = dynamic_cast<const tacky::Var*>(binary->src2.get())) {
-                src2 = std::make_unique<Pseudo>(v->name);
-            }
-            
-            std::string dstName = dynamic_cast<const tacky::Var*>(binary->dst.get())->name;
-            auto dst = std::make_unique<Pseudo>(dstName);
-
-            if (binary->op == tacky::BinaryOp::DIVIDE || binary->op == tacky::BinaryOp::REMAINDER) {
-                // mov src1, %eax
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::move(src1),
-                    std::make_unique<Register>(Reg::AX)
-                ));
-
-                // cdq
-                asdlInstructions.push_back(std::make_unique<Cdq>());
-
-                // idiv src2
-                asdlInstructions.push_back(std::make_unique<Idiv>(
-                    std::move(src2)
-                ));
-
-                // mov %eax or %edx -> dst
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Register>(
-                        binary->op == tacky::BinaryOp::DIVIDE ? Reg::AX : Reg::DX
-                    ),
-                    std::move(dst)
-                ));
-            } else if (binary->op == tacky::BinaryOp::ADD || binary->op == tacky::BinaryOp::SUBTRACT || binary->op == tacky::BinaryOp::MULTIPLY) {
-                BinaryOperator op;
-                switch (binary->op) {
-                    case tacky::BinaryOp::ADD:      op = BinaryOperator::ADD; break;
-                    case tacky::BinaryOp::SUBTRACT: op = BinaryOperator::SUB; break;
-                    case tacky::BinaryOp::MULTIPLY: op = BinaryOperator::MULT; break;
-                    default: throw std::runtime_error("Unknown BinaryOp");
-                }
-
-                // mov src1, dst
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::move(src1),
-                    std::make_unique<Pseudo>(dst->getIdentifier())
-                ));
-
-                // op src2, dst
-                asdlInstructions.push_back(std::make_unique<Binary>(
-                    op,
-                    std::move(src2),
-                    std::move(dst)
-                ));
-            } else {
-                CondNode op;
-                switch (binary->op) {
-                    case tacky::BinaryOp::EQUAL:      op = CondNode::E; break;
-                    case tacky::BinaryOp::NOTEQUAL: op = CondNode::NE; break;
-                    case tacky::BinaryOp::LESSTHAN: op = CondNode::L; break;
-                    case tacky::BinaryOp::LESSEQ:      op = CondNode::LE; break;
-                    case tacky::BinaryOp::GREATERTHAN: op = CondNode::G; break;
-                    case tacky::BinaryOp::GREATEREQ: op = CondNode::GE; break;
-                    default: throw std::runtime_error("Unknown RelationOp in BinaryOp");
-                }
-
-                asdlInstructions.push_back(std::make_unique<Cmp>(
-                    std::move(src1),
-                    std::move(src2)
-                ));
-
-                asdlInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Imm>(0),
-                    convertValToOperand(binary->dst)
-                ));
-
-                asdlInstructions.push_back(std::make_unique<SetCC>(
-                    op,
-                    convertValToOperand(binary->dst)
-                ));
-            }
+        out.push_back(std::make_unique<Cmp>(
+            std::move(src1),
+            std::move(src2)
+        ));
+
+        out.push_back(std::make_unique<Mov>(
+            std::make_unique<Imm>(0),
+            convertValToOperand(binary.dst)
+        ));
+
+        out.push_back(std::make_unique<SetCC>(
+            op,
+            convertValToOperand(binary.dst)
+        ));
+    }
+}
+
+// --- convertTackyToASDL
+ASDLProgram convertTackyToASDL(const tacky::Program& tackyProgram) {
+    ASDLInstructions asdlInstructions;
+
+    for (const auto& instr : tackyProgram.function->body) {
+        const tacky::Instruction* in = instr.get();
+
+        switch (in->kind) {
+            case tacky::InstructionKind::Return:
+                convertReturn(*static_cast<const tacky::Return*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::Jump:
+                convertJump(*static_cast<const tacky::Jump*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::JumpIfZero:
+                convertJumpIfZero(*static_cast<const tacky::JumpIfZero*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::JumpIfNotZero:
+                convertJumpIfNotZero(*static_cast<const tacky::JumpIfNotZero*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::Copy:
+                convertCopy(*static_cast<const tacky::Copy*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::Label:
+                convertLabel(*static_cast<const tacky::Label*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::Unary:
+                convertUnary(*static_cast<const tacky::Unary*>(in), asdlInstructions);
+                break;
+            case tacky::InstructionKind::Binary:
+                convertBinary(*static_cast<const tacky::Binary*>(in), asdlInstructions);
+                break;
         }
     }
 
@@ -518,80 +538,91 @@ std::unique_ptr<Operand> replaceIfPseudo(Operand* op, std::unordered_map<std::st
     return nullptr;
 }
 
-int replacePseudosWithStack(ASDLProgram& program) {
-    int stackOffset = -4;
-    std::unordered_map<std::string, int> pseudoOffsets;
-    auto& instructions = program.getFunctionDefinition()->getInstructions();
+/**
+ * @brief Replaces the Pseudo operands of a single instruction with Stack operands.
+ *
+ * @param instr The instruction to rewrite in place.
+ * @param offsets Stack offset already assigned to each pseudo register.
+ * @param stackOffset Next free stack offset, updated when a new pseudo is seen.
+ */
+static void replacePseudosInInstruction(Instruction* instr, std::unordered_map<std::string, int>& offsets, int& stackOffset) {
+    if (auto unary = dynamic_cast<Unary*>(instr)) {
+        auto dst = unary->releaseDst();
+        if (auto replaced = replaceIfPseudo(dst.get(), offsets, stackOffset))
+            unary->setDst(std::move(replaced));
+        else
+            unary->setDst(std::move(dst));
+    }
 
-    for (auto& instr : instructions) {
-        if (auto unary = dynamic_cast<Unary*>(instr.get())) {
-            auto dst = unary->releaseDst();
-            if (auto replaced = replaceIfPseudo(dst.get(), pseudoOffsets, stackOffset))
-                unary->setDst(std::move(replaced));
-            else
-                unary->setDst(std::move(dst));
-        }
+    else if (auto mov = dynamic_cast<Mov*>(instr)) {
+        auto dst = mov->releaseDst();
+        auto src = mov->releaseSrc();
 
-        else if (auto mov = dynamic_cast<Mov*>(instr.get())) {
-            auto dst = mov->releaseDst();
-            auto src = mov->releaseSrc();
+        if (auto replaced = replaceIfPseudo(dst.get(), offsets, stackOffset))
+            mov->setDst(std::move(replaced));
+        else
+            mov->setDst(std::move(dst));
 
-            if (auto replaced = replaceIfPseudo(dst.get(), pseudoOffsets, stackOffset))
-                mov->setDst(std::move(replaced));
-            else
-                mov->setDst(std::move(dst));
+        if (auto replaced = replaceIfPseudo(src.get(), offsets, stackOffset))
+            mov->setSrc(std::move(replaced));
+        else
+            mov->setSrc(std::move(src));
+    }
 
-            if (auto replaced = replaceIfPseudo(src.get(), pseudoOffsets, stackOffset))
-                mov->setSrc(std::move(replaced));
-            else
-                mov->setSrc(std::move(src));
-        }
+    else if (auto binary = dynamic_cast<Binary*>(instr)) {
+        auto dst = binary->releaseDst();
+        auto src = binary->releaseSrc();
 
-        else if (auto binary = dynamic_cast<Binary*>(instr.get())) {
-            auto dst = binary->releaseDst();
-            auto src = binary->releaseSrc();
+        if (auto replaced = replaceIfPseudo(dst.get(), offsets, stackOffset))
+            binary->setDst(std::move(replaced));
+        else
+            binary->setDst(std::move(dst));
 
-            if (auto replaced = replaceIfPseudo(dst.get(), pseudoOffsets, stackOffset))
-                binary->setDst(std::move(replaced));
-            else
-                binary->setDst(std::move(dst));
+        if (auto replaced = replaceIfPseudo(src.get(), offsets, stackOffset))
+            binary->setSrc(std::move(replaced));
+        else
+            binary->setSrc(std::move(src));
+    }
 
-            if (auto replaced = replaceIfPseudo(src.get(), pseudoOffsets, stackOffset))
-                binary->setSrc(std::move(replaced));
-            else
-                binary->setSrc(std::move(src));
-        }
+    else if (auto cmp = dynamic_cast<Cmp*>(instr)) {
+        auto lhs = cmp->releaseLHS();
+        auto rhs = cmp->releaseRHS();
 
-        else if (auto cmp = dynamic_cast<Cmp*>(instr.get())) {
-            auto lhs = cmp->releaseLHS();
-            auto rhs = cmp->releaseRHS();
+        if (auto replaced = replaceIfPseudo(lhs.get(), offsets, stackOffset))
+            cmp->setLHS(std::move(replaced));
+        else
+            cmp->setLHS(std::move(lhs));
 
-            if (auto replaced = replaceIfPseudo(lhs.get(), pseudoOffsets, stackOffset))
-                cmp->setLHS(std::move(replaced));
-            else
-                cmp->setLHS(std::move(lhs));
+        if (auto replaced = replaceIfPseudo(rhs.get(), offsets, stackOffset))
+            cmp->setRHS(std::move(replaced));
+        else
+            cmp->setRHS(std::move(rhs));
+    }
 
-            if (auto replaced = replaceIfPseudo(rhs.get(), pseudoOffsets, stackOffset))
-                cmp->setRHS(std::move(replaced));
-            else
-                cmp->setRHS(std::move(rhs));
-        }
+    else if (auto setcc = dynamic_cast<SetCC*>(instr)) {
+        auto dst = setcc->releaseDst();
+        if (auto replaced = replaceIfPseudo(dst.get(), offsets, stackOffset))
+            setcc->setDst(std::move(replaced));
+        else
+            setcc->setDst(std::move(dst));
+    }
 
-        else if (auto setcc = dynamic_cast<SetCC*>(instr.get())) {
-            auto dst = setcc->releaseDst();
-            if (auto replaced = replaceIfPseudo(dst.get(), pseudoOffsets, stackOffset))
-                setcc->setDst(std::move(replaced));
-            else
-                setcc->setDst(std::move(dst));
-        }
+    else if (auto idiv = dynamic_cast<Idiv*>(instr)) {
+        auto dst = idiv->releaseDst();
+        if (auto replaced = replaceIfPseudo(dst.get(), offsets, stackOffset))
+            idiv->setDst(std::move(replaced));
+        else
+            idiv->setDst(std::move(dst));
+    }
+}
 
-        else if (auto idiv = dynamic_cast<Idiv*>(instr.get())) {
-            auto dst = idiv->releaseDst();
-            if (auto replaced = replaceIfPseudo(dst.get(), pseudoOffsets, stackOffset))
-                idiv->setDst(std::move(replaced));
-            else
-                idiv->setDst(std::move(dst));
-        }
+int replacePseudosWithStack(ASDLProgram& program) {
+    int stackOffset = -4;
+    std::unordered_map<std::string, int> pseudoOffsets;
+    auto& instructions = program.getFunctionDefinition()->getInstructions();
+
+    for (auto& instr : instructions) {
+        replacePseudosInInstruction(instr.get(), pseudoOffsets, stackOffset);
     }
 
     return -stackOffset; 
@@ -610,199 +641,214 @@ void insertAllocateStack(ASDLProgram& program, int stackSize) {
     instructions.insert(instructions.begin(), std::move(allocate));
 }
 
-void legalizeMovMemoryToMemory(ASDLProgram& program) {
-    auto& instructions = program.getFunctionDefinition()->getInstructions();
-    std::vector<std::unique_ptr<Instruction>> legalizedInstructions;
+/**
+ * @brief Legalizes a single instruction, appending the result to an output list.
+ *
+ * Instructions that are already legal are moved to the output unchanged;
+ * illegal operand combinations are rewritten through the scratch registers.
+ *
+ * @param instr The instruction to legalize (ownership may be taken).
+ * @param out The list receiving the legalized instruction(s).
+ */
+static void legalizeInstruction(std::unique_ptr<Instruction>& instr, std::vector<std::unique_ptr<Instruction>>& out) {
+    if (auto mov = dynamic_cast<Mov*>(instr.get())) {
+        Operand* src = mov->getSrc();
+        Operand* dst = mov->getDst();
+
+        bool srcIsMem = dynamic_cast<Stack*>(src);
+        bool dstIsMem = dynamic_cast<Stack*>(dst);
+
+        if (srcIsMem && dstIsMem) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(src->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Mov>(
+                std::make_unique<Register>(Reg::R10),
+                std::unique_ptr<Operand>(dst->clone())
+            ));
+        } else {
+            out.push_back(std::move(instr));
+        }
 
-    for (auto& instr : instructions) {
+    } else if (auto idiv = dynamic_cast<Idiv*>(instr.get())) {
+        Operand* operand = idiv->getDst();
 
-        if (auto mov = dynamic_cast<Mov*>(instr.get())) {
-            Operand* src = mov->getSrc();
-            Operand* dst = mov->getDst();
-
-            bool srcIsMem = dynamic_cast<Stack*>(src);
-            bool dstIsMem = dynamic_cast<Stack*>(dst);
-
-            if (srcIsMem && dstIsMem) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(src->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Register>(Reg::R10),
-                    std::unique_ptr<Operand>(dst->clone())
-                ));
-            } else {
-                legalizedInstructions.push_back(std::move(instr));
-            }
-
-        } else if (auto idiv = dynamic_cast<Idiv*>(instr.get())) {
-            Operand* operand = idiv->getDst();
-
-            if (dynamic_cast<Imm*>(operand)) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(operand->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Idiv>(
-                    std::make_unique<Register>(Reg::R10)
-                ));
-            } else {
-                legalizedInstructions.push_back(std::move(instr));
-            }
-
-        } else if (auto bin = dynamic_cast<Binary*>(instr.get())) {
-            Operand* src = bin->getSrc();
-            Operand* dst = bin->getDst();
-            BinaryOperator op = bin->getBinaryOperator();
-
-            bool srcIsMem = dynamic_cast<Stack*>(src);
-            bool dstIsMem = dynamic_cast<Stack*>(dst);
-            bool srcIsImm = dynamic_cast<Imm*>(src);
-
-            if ((op == BinaryOperator::ADD || op == BinaryOperator::SUB) && srcIsMem && dstIsMem) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(src->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Binary>(
-                    op,
-                    std::make_unique<Register>(Reg::R10),
-                    std::unique_ptr<Operand>(dst->clone())
-                ));
-            } else if (op == BinaryOperator::MULT && srcIsImm && dstIsMem) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(dst->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Binary>(
-                    op,
-                    std::unique_ptr<Operand>(src->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Register>(Reg::R11),
-                    std::unique_ptr<Operand>(dst->clone())
-                ));
-            } else if (op == BinaryOperator::MULT && srcIsMem && dstIsMem) {
-                // Ex: imull -8(%rbp), -12(%rbp) → temp = [dst]; temp *= [src]; dst = temp
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(dst->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(src->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Binary>(
-                    op,
-                    std::make_unique<Register>(Reg::R10),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::make_unique<Register>(Reg::R11),
-                    std::unique_ptr<Operand>(dst->clone())
-                ));
-            }
-            else {
-                legalizedInstructions.push_back(std::move(instr));
-            }
-
-        } else if (auto cmp = dynamic_cast<Cmp*>(instr.get())) {
-            Operand* lhs = cmp->getLHS();
-            Operand* rhs = cmp->getRHS();
-
-            bool lhsIsMem = dynamic_cast<Stack*>(lhs);
-            bool rhsIsMem = dynamic_cast<Stack*>(rhs);
-            bool lhsIsImm = dynamic_cast<Imm*>(lhs);
-            bool rhsIsImm = dynamic_cast<Imm*>(rhs);
-
-            if (lhsIsMem && rhsIsMem) {
-                // mem vs mem → use temp register
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(lhs->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Cmp>(
-                    std::make_unique<Register>(Reg::R10),
-                    std::unique_ptr<Operand>(rhs->clone())
-                ));
-            } else if (lhsIsMem && rhsIsImm) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(rhs->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Cmp>(
-                    std::unique_ptr<Operand>(lhs->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-            } else if (lhsIsImm && rhsIsMem) {
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(lhs->clone()),
-                    std::make_unique<Register>(Reg::R11)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Cmp>(
-                    std::make_unique<Register>(Reg::R11),
-                    std::unique_ptr<Operand>(rhs->clone())
-                ));
-            } else if (lhsIsImm && rhsIsImm) {
-                // illegal: imm vs imm, must legalize
-                legalizedInstructions.push_back(std::make_unique<Mov>(
-                    std::unique_ptr<Operand>(lhs->clone()),
-                    std::make_unique<Register>(Reg::R10)
-                ));
-                legalizedInstructions.push_back(std::make_unique<Cmp>(
-                    std::make_unique<Register>(Reg::R10),
-                    std::unique_ptr<Operand>(rhs->clone())
-                ));
-            } else {
-                // already legal (e.g., reg vs imm)
-                legalizedInstructions.push_back(std::move(instr));
-            }
+        if (dynamic_cast<Imm*>(operand)) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(operand->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Idiv>(
+                std::make_unique<Register>(Reg::R10)
+            ));
+        } else {
+            out.push_back(std::move(instr));
+        }
+
+    } else if (auto bin = dynamic_cast<Binary*>(instr.get())) {
+        Operand* src = bin->getSrc();
+        Operand* dst = bin->getDst();
+        BinaryOperator op = bin->getBinaryOperator();
+
+        bool srcIsMem = dynamic_cast<Stack*>(src);
+        bool dstIsMem = dynamic_cast<Stack*>(dst);
+        bool srcIsImm = dynamic_cast<Imm*>(src);
+
+        if ((op == BinaryOperator::ADD || op == BinaryOperator::SUB) && srcIsMem && dstIsMem) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(src->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Binary>(
+                op,
+                std::make_unique<Register>(Reg::R10),
+                std::unique_ptr<Operand>(dst->clone())
+            ));
+        } else if (op == BinaryOperator::MULT && srcIsImm && dstIsMem) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(dst->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Binary>(
+                op,
+                std::unique_ptr<Operand>(src->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Mov>(
+                std::make_unique<Register>(Reg::R11),
+                std::unique_ptr<Operand>(dst->clone())
+            ));
+        } else if (op == BinaryOperator::MULT && srcIsMem && dstIsMem) {
+            // Ex: imull -8(%rbp), -12(%rbp) → temp = [dst]; temp *= [src]; dst = temp
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(dst->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(src->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Binary>(
+                op,
+                std::make_unique<Register>(Reg::R10),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Mov>(
+                std::make_unique<Register>(Reg::R11),
+                std::unique_ptr<Operand>(dst->clone())
+            ));
+        }
+        else {
+            out.push_back(std::move(instr));
+        }
 
+    } else if (auto cmp = dynamic_cast<Cmp*>(instr.get())) {
+        Operand* lhs = cmp->getLHS();
+        Operand* rhs = cmp->getRHS();
+
+        bool lhsIsMem = dynamic_cast<Stack*>(lhs);
+        bool rhsIsMem = dynamic_cast<Stack*>(rhs);
+        bool lhsIsImm = dynamic_cast<Imm*>(lhs);
+        bool rhsIsImm = dynamic_cast<Imm*>(rhs);
+
+        if (lhsIsMem && rhsIsMem) {
+            // mem vs mem → use temp register
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(lhs->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Cmp>(
+                std::make_unique<Register>(Reg::R10),
+                std::unique_ptr<Operand>(rhs->clone())
+            ));
+        } else if (lhsIsMem && rhsIsImm) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(rhs->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Cmp>(
+                std::unique_ptr<Operand>(lhs->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+        } else if (lhsIsImm && rhsIsMem) {
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(lhs->clone()),
+                std::make_unique<Register>(Reg::R11)
+            ));
+            out.push_back(std::make_unique<Cmp>(
+                std::make_unique<Register>(Reg::R11),
+                std::unique_ptr<Operand>(rhs->clone())
+            ));
+        } else if (lhsIsImm && rhsIsImm) {
+            // illegal: imm vs imm, must legalize
+            out.push_back(std::make_unique<Mov>(
+                std::unique_ptr<Operand>(lhs->clone()),
+                std::make_unique<Register>(Reg::R10)
+            ));
+            out.push_back(std::make_unique<Cmp>(
+                std::make_unique<Register>(Reg::R10),
+                std::unique_ptr<Operand>(rhs->clone())
+            ));
         } else {
-            // All other instructions passed through
-            legalizedInstructions.push_back(std::move(instr));
+            // already legal (e.g., reg vs imm)
+            out.push_back(std::move(instr));
         }
+
+    } else {
+        // All other instructions passed through
+        out.push_back(std::move(instr));
+    }
+}
+
+void legalizeMovMemoryToMemory(ASDLProgram& program) {
+    auto& instructions = program.getFunctionDefinition()->getInstructions();
+    std::vector<std::unique_ptr<Instruction>> legalizedInstructions;
+    legalizedInstructions.reserve(instructions.size());
+
+    for (auto& instr : instructions) {
+        legalizeInstruction(instr, legalizedInstructions);
     }
 
     instructions = std::move(legalizedInstructions);
 }
 
+int finalizeASDL(ASDLProgram& program) {
+    auto& instructions = program.getFunctionDefinition()->getInstructions();
+    std::vector<std::unique_ptr<Instruction>> finalInstructions;
+    finalInstructions.reserve(instructions.size() + 1);
+
+    // Slot for the AllocateStack, filled in once the frame size is known
+    finalInstructions.emplace_back();
 
+    int stackOffset = -4;
+    std::unordered_map<std::string, int> pseudoOffsets;
 
-// --- writeASMToFile ---
-void writeASMToFile(const ASDLProgram& program, const std::string& filename) {
-    std::ofstream ofs(filename);
-    if (!ofs.is_open()) {
-        throw std::runtime_error("Failed to open output file: " + filename);
+    for (auto& instr : instructions) {
+        replacePseudosInInstruction(instr.get(), pseudoOffsets, stackOffset);
+        legalizeInstruction(instr, finalInstructions);
     }
 
-    std::string asmCode = program.toASM();
+    finalInstructions.front() = std::make_unique<AllocateStack>(-stackOffset);
+    instructions = std::move(finalInstructions);
 
-    // Trim trailing whitespace
-    while (!asmCode.empty() && std::isspace(asmCode.back())) {
-        asmCode.pop_back();
-    }
+    return -stackOffset;
+}
 
-    // Get the last non-empty line
-    size_t lastLineStart = asmCode.find_last_of('\n');
-    std::string lastLine = asmCode.substr(lastLineStart + 1);
-    while (lastLine.empty() && lastLineStart != std::string::npos) {
-        asmCode.erase(lastLineStart);
-        lastLineStart = asmCode.find_last_of('\n');
-        lastLine = asmCode.substr(lastLineStart + 1);
-    }
 
-    bool endsWithRet = lastLine.find("ret") != std::string::npos;
+
+// --- generateASM ---
+std::string generateASM(const ASDLProgram& program) {
+    std::ostringstream oss;
+    program.writeASM(oss);
+
+    const auto& instructions = program.getFunctionDefinition()->getInstructions();
+    bool endsWithRet = !instructions.empty() && dynamic_cast<const Ret*>(instructions.back().get());
 
     if (!endsWithRet) {
         // Add return sequence only if no unconditional ret at end
-        asmCode += "\n  movq %rbp, %rsp\n  popq %rbp\n  movl $0, %eax\n  ret";
+        oss << "  movq %rbp, %rsp\n  popq %rbp\n  movl $0, %eax\n  ret\n";
     }
 
-    ofs << asmCode;
-    ofs.close();
+    return oss.str();
 }
-
-
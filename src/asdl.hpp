@@ -5,6 +5,7 @@
 #include <memory>
 #include <vector>
 #include <variant>
+#include <ostream>
 
 #include "ast.hpp"
 #include "tacky.hpp"
@@ -21,10 +22,28 @@ public:
      */
     virtual std::string toString() const = 0;
 
+    /**
+     * @brief Write the string representation (debug) to a stream.
+     *
+     * Nodes that contain other nodes override this to write their children
+     * straight into the stream instead of building intermediate strings.
+     */
+    virtual void printTo(std::ostream& os) const { os << toString(); }
+
     /**
      * @brief Convert node to assembly code string.
      */
     virtual std::string toASM() const = 0;
+
+    /**
+     * @brief Write the assembly code for this node to a stream.
+     *
+     * Container nodes override this to stream their instructions one by one
+     * instead of concatenating a temporary string per node. The compile path
+     * still collects the output into one string via generateASM(), since that
+     * text is both piped to clang and stored in the assembly cache.
+     */
+    virtual void writeASM(std::ostream& os) const { os << toASM(); }
 };
 
 /**
@@ -355,7 +374,9 @@ public:
     const std::vector<std::unique_ptr<Instruction>>& getInstructions() const;
 
     std::string toString() const override;
+    void printTo(std::ostream& os) const override;
     std::string toASM() const override;
+    void writeASM(std::ostream& os) const override;
 };
 
 /**
@@ -367,7 +388,9 @@ public:
     explicit ASDLProgram(std::unique_ptr<FunctionDefinition> funcDef);
 
     std::string toString() const override;
+    void printTo(std::ostream& os) const override;
     std::string toASM() const override;
+    void writeASM(std::ostream& os) const override;
     FunctionDefinition* getFunctionDefinition() const;
 
 };
@@ -422,13 +445,27 @@ void insertAllocateStack(ASDLProgram& program, int stackSize);
  */
 void legalizeMovMemoryToMemory(ASDLProgram& program);
 
+/**
+ * @brief Runs the post-conversion passes over the ASDL program in a single traversal.
+ *
+ * Equivalent to calling replacePseudosWithStack, insertAllocateStack and
+ * legalizeMovMemoryToMemory in sequence, but each instruction is visited once:
+ * its pseudo registers are assigned stack slots and it is legalized immediately.
+ * The AllocateStack instruction is placed first once the frame size is known.
+ *
+ * @param program The ASDL program to transform.
+ * @return stack offset (size of the stack frame in bytes)
+ */
+int finalizeASDL(ASDLProgram& program);
 
 /**
- * @brief Write the assembly code generated from the ASDL Program to a file.
+ * @brief Generate the assembly code for the ASDL Program as a string.
+ *
+ * Appends the function epilogue if the instructions do not already end with a ret.
  *
  * @param program The ASDL Program node.
- * @param filename Output filename.
+ * @return The complete assembly text, ready to be passed to the assembler.
  */
-void writeASMToFile(const ASDLProgram& program, const std::string& filename);
+std::string generateASM(const ASDLProgram& program);
 
 #endif // ASDL_HPP
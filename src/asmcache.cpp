@@ -0,0 +1,185 @@
+/**
+ * @file asmcache.cpp
+ * @brief Implementation of the on-disk assembly cache.
+ */
+
+#include "asmcache.hpp"
+
+#include <cstdint>
+#include <cstdlib>
+#include <filesystem>
+#include <fstream>
+#include <sstream>
+#include <string>
+#include <system_error>
+#include <unistd.h>
+
+#ifdef __APPLE__
+#include <mach-o/dyld.h>
+#endif
+
+namespace fs = std::filesystem;
+
+/**
+ * @brief 64-bit FNV-1a hash, continuing from a previous hash value.
+ */
+static std::uint64_t fnv1a(const std::string& data, std::uint64_t hash = 14695981039346656037ULL) {
+    for (unsigned char c : data) {
+        hash ^= c;
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+/**
+ * @brief Returns the cache directory, or an empty path if none can be determined.
+ */
+static fs::path cacheDirectory() {
+    if (const char* xdg = std::getenv("XDG_CACHE_HOME"); xdg && *xdg) {
+        return fs::path(xdg) / "athos" / "asm";
+    }
+    if (const char* home = std::getenv("HOME"); home && *home) {
+        return fs::path(home) / ".cache" / "athos" / "asm";
+    }
+    return {};
+}
+
+/**
+ * @brief Locates the running compiler executable.
+ *
+ * Uses /proc/self/exe on Linux and _NSGetExecutablePath on macOS. Otherwise argv[0]
+ * is used when it contains a '/', and a bare name is looked up in PATH the same way
+ * the shell found it. A bare name is never resolved against the current directory.
+ *
+ * @param compilerPath Path used to invoke the compiler (argv[0]).
+ * @return Path of the executable, or an empty path if it cannot be determined.
+ */
+static fs::path executablePath(const std::string& compilerPath) {
+    std::error_code ec;
+    fs::path exe = fs::read_symlink("/proc/self/exe", ec);
+    if (!ec) return exe;
+
+#ifdef __APPLE__
+    uint32_t size = 0;
+    _NSGetExecutablePath(nullptr, &size);
+    std::string buffer(size, '\0');
+    if (_NSGetExecutablePath(&buffer[0], &size) == 0) {
+        return fs::path(buffer.c_str());
+    }
+#endif
+
+    if (compilerPath.find('/') != std::string::npos) return compilerPath;
+
+    const char* path = std::getenv("PATH");
+    if (!path) return {};
+
+    std::string dirs = path;
+    size_t start = 0;
+    while (start <= dirs.size()) {
+        size_t end = dirs.find(':', start);
+        if (end == std::string::npos) end = dirs.size();
+        std::string dir = dirs.substr(start, end - start);
+        if (!dir.empty()) {
+            fs::path candidate = fs::path(dir) / compilerPath;
+            if (fs::is_regular_file(candidate, ec) && access(candidate.c_str(), X_OK) == 0) {
+                return candidate;
+            }
+        }
+        start = end + 1;
+    }
+    return {};
+}
+
+/**
+ * @brief Identifies the running compiler binary by its size and modification time.
+ *
+ * @param compilerPath Path used to invoke the compiler (argv[0]), used when the
+ *                     executable cannot be located by the operating system.
+ * @return An identity string, or an empty string if the executable cannot be found.
+ */
+static std::string compilerIdentity(const std::string& compilerPath) {
+    fs::path exe = executablePath(compilerPath);
+    if (exe.empty()) return "";
+
+    std::error_code ec;
+    auto size = fs::file_size(exe, ec);
+    if (ec) return "";
+    auto mtime = fs::last_write_time(exe, ec);
+    if (ec) return "";
+
+    return std::to_string(size) + ":" + std::to_string(mtime.time_since_epoch().count());
+}
+
+std::string asmCachePath(const std::string& source, const std::string& compilerPath) {
+    // Without a way to tell compiler builds apart, caching could serve stale output
+    std::string identity = compilerIdentity(compilerPath);
+    if (identity.empty()) return "";
+
+    fs::path dir = cacheDirectory();
+    if (dir.empty()) return "";
+
+    std::error_code ec;
+    fs::create_directories(dir, ec);
+    if (ec) return "";
+
+    std::uint64_t key = fnv1a(source, fnv1a(identity));
+
+    static const char digits[] = "0123456789abcdef";
+    std::string name(16, '0');
+    for (int i = 15; i >= 0; --i) {
+        name[i] = digits[key & 0xf];
+        key >>= 4;
+    }
+
+    return (dir / (name + ".s")).string();
+}
+
+/**
+ * @brief Builds the header stored in front of the assembly in every cache entry.
+ *
+ * The header records the compiler identity and the full source text, so a hit is
+ * only trusted when both match exactly; a hash collision is treated as a miss.
+ */
+static std::string entryHeader(const std::string& source, const std::string& compilerPath) {
+    return compilerIdentity(compilerPath) + "\n" + std::to_string(source.size()) + "\n" + source;
+}
+
+bool loadCachedASM(const std::string& cachePath, const std::string& source,
+                   const std::string& compilerPath, std::string& assembly) {
+    if (cachePath.empty()) return false;
+
+    std::ifstream in(cachePath, std::ios::binary);
+    if (!in) return false;
+
+    std::ostringstream contents;
+    contents << in.rdbuf();
+    if (!in) return false;
+
+    std::string entry = contents.str();
+    std::string header = entryHeader(source, compilerPath);
+    if (entry.size() <= header.size() || entry.compare(0, header.size(), header) != 0) {
+        return false;
+    }
+
+    assembly = entry.substr(header.size());
+    return true;
+}
+
+void storeCachedASM(const std::string& cachePath, const std::string& source,
+                    const std::string& compilerPath, const std::string& assembly) {
+    if (cachePath.empty() || assembly.empty()) return;
+
+    std::string tmpPath = cachePath + ".tmp" + std::to_string(getpid());
+    std::ofstream out(tmpPath, std::ios::binary);
+    out << entryHeader(source, compilerPath);
+    out.write(assembly.data(), static_cast<std::streamsize>(assembly.size()));
+    out.close();
+
+    std::error_code ec;
+    if (out) {
+        fs::rename(tmpPath, cachePath, ec);
+    }
+    if (!out || ec) {
+        fs::remove(tmpPath, ec);
+    }
+}
@@ -0,0 +1,64 @@
+/**
+ * @file asmcache.hpp
+ * @brief On-disk cache of generated assembly, keyed by the source code.
+ *
+ * Compiling an unchanged source file always produces the same assembly, so the
+ * driver can reuse the output of a previous run instead of lexing, parsing,
+ * validating and lowering the program again.
+ *
+ * Cache entries live in `$XDG_CACHE_HOME/athos/asm` (or `~/.cache/athos/asm`).
+ * The key is a hash of the source text together with the size and modification
+ * time of the compiler executable, so rebuilding the compiler never reuses
+ * assembly produced by an older version. Each entry also stores the compiler
+ * identity and the source text, which are compared on every hit, so two sources
+ * whose keys collide can never share assembly.
+ * Any failure to read or write the cache is ignored and simply results in a
+ * full compilation.
+ */
+
+#ifndef ASMCACHE_HPP
+#define ASMCACHE_HPP
+
+#include <string>
+
+/**
+ * @brief Computes the cache entry path for the given source code.
+ *
+ * Creates the cache directory if it does not exist yet.
+ *
+ * @param source The full source code being compiled.
+ * @param compilerPath Path used to invoke the compiler (argv[0]).
+ * @return Path of the cache entry, or an empty string if caching is unavailable.
+ */
+std::string asmCachePath(const std::string& source, const std::string& compilerPath);
+
+/**
+ * @brief Reads cached assembly for the given cache entry.
+ *
+ * The entry is only used if it was stored for exactly the same source text and
+ * compiler build; a hash collision or an empty entry counts as a miss.
+ *
+ * @param cachePath Cache entry path returned by asmCachePath().
+ * @param source The full source code being compiled.
+ * @param compilerPath Path used to invoke the compiler (argv[0]).
+ * @param assembly Receives the cached assembly text.
+ * @return True if a matching entry was found and read, false otherwise.
+ */
+bool loadCachedASM(const std::string& cachePath, const std::string& source,
+                   const std::string& compilerPath, std::string& assembly);
+
+/**
+ * @brief Stores freshly generated assembly in the cache.
+ *
+ * The entry is written under a temporary name and renamed into place, so
+ * concurrent compilers never observe a partially written entry.
+ *
+ * @param cachePath Cache entry path returned by asmCachePath().
+ * @param source The full source code the assembly was generated from.
+ * @param compilerPath Path used to invoke the compiler (argv[0]).
+ * @param assembly The generated assembly text.
+ */
+void storeCachedASM(const std::string& cachePath, const std::string& source,
+                    const std::string& compilerPath, const std::string& assembly);
+
+#endif // ASMCACHE_HPP
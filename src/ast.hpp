@@ -4,12 +4,13 @@
 #include <string>
 #include <memory>
 #include <vector>
+#include <cstdint>
 #include "lexer.hpp"
 
 /**
  * @brief Enum class for expression types.
  */
-enum class ExpressionType {
+enum class ExpressionType : std::uint8_t {
     CONSTANT,
     UNARY,
     BINARY,
@@ -21,7 +22,7 @@ enum class ExpressionType {
 /**
  * @brief Enum class for block item types.
  */
-enum class BlockItemType {
+enum class BlockItemType : std::uint8_t {
     STATEMENT,
     DECLARATION
 };
@@ -29,7 +30,7 @@ enum class BlockItemType {
 /**
  * @brief Enum class for statement types.
  */
-enum class StatementType {
+enum class StatementType : std::uint8_t {
     RETURN,
     EXPRESSION,
     NULL_STMT,
@@ -45,7 +46,7 @@ enum class StatementType {
 /**
  * @brief Enum class for unary operators.
  */
-enum class UnaryOpast {
+enum class UnaryOpast : std::uint8_t {
     COMPLEMENT,
     NEGATE,
     NOT
@@ -54,7 +55,7 @@ enum class UnaryOpast {
 /**
  * @brief Enum class for binary operators.
  */
-enum class BinaryOpast {
+enum class BinaryOpast : std::uint8_t {
     ADD,
     SUBTRACT,
     MULTIPLY,
@@ -73,17 +74,20 @@ enum class BinaryOpast {
 /**
  * @brief Enum class for For_Init 
  */
-enum class ForInitType {
+enum class ForInitType : std::uint8_t {
     INIT_DECL,
     INIT_EXP
 };
 
 /**
  * @brief Base class for all Abstract Syntax Tree (AST) nodes.
+ *
+ * Nodes are always owned through their concrete type, so the base carries no
+ * virtual destructor and adds no vtable pointer to every node.
  */
 class ASTNode {
-public:
-    virtual ~ASTNode() = default;
+protected:
+    ~ASTNode() = default;
 };
 
 /**
@@ -93,15 +97,15 @@ class Expression : public ASTNode {
 public:
     ExpressionType type;
 
-    // Constant
-    int value = 0;
+    // Scalar fields are grouped ahead of the pointers so they share one word
+    UnaryOpast un_op;       // Unary expression
+    BinaryOpast bin_op;     // Binary expression
+    int value = 0;          // Constant
 
     // Unary expression
-    UnaryOpast un_op;
     std::unique_ptr<Expression> operand;
 
     // Binary expression
-    BinaryOpast bin_op;
     std::unique_ptr<Expression> operand1;
     std::unique_ptr<Expression> operand2;
 
@@ -187,9 +191,15 @@ public:
     // For return or expression statements
     std::unique_ptr<Expression> expression;
 
+    // For 'for' loops (declared in initialization order)
+    std::unique_ptr<ForInit> forInit;
+
     // For if / while / etc.
     std::unique_ptr<Expression> condition;
 
+    // For 'for' loops
+    std::unique_ptr<Expression> postExpr;
+
     // For loop bodies and condition branches
     std::unique_ptr<Statement> thenBranch;
     std::unique_ptr<Statement> elseBranch;  // used for IF
@@ -198,10 +208,6 @@ public:
     // For compound statements
     std::unique_ptr<Block> block;
 
-    // For 'for' loops
-    std::unique_ptr<ForInit> forInit;
-    std::unique_ptr<Expression> postExpr;
-
     // Constructors
     Statement(std::unique_ptr<Expression> expr, StatementType type)
         : type(type), expression(std::move(expr)) {}
@@ -4,6 +4,15 @@
 #include <vector>
 #include <string>
 #include <memory>
+#include <algorithm>
+#include <cerrno>
+#include <cstring>
+#include <csignal>
+#include <spawn.h>
+#include <sys/wait.h>
+#include <unistd.h>
+#include <thread>
+#include <unordered_map>
 
 #include "lexer.hpp"
 #include "parser.hpp"
@@ -12,7 +21,215 @@
 #include "tacky.hpp"
 #include "lowerer.hpp"
 #include "validate.hpp"
+#include "asmcache.hpp"
 
+extern char** environ;
+
+/**
+ * @brief Runs an external program directly, without going through a shell.
+ *
+ * The program is looked up in PATH and its arguments are passed as-is, so
+ * file names never need quoting and no intermediate /bin/sh process is started.
+ * The given input is fed to the program's standard input through a pipe.
+ *
+ * @param args Program name followed by its arguments.
+ * @param input Data written to the program's standard input.
+ * @return The program's exit status, or -1 if it could not be started or was killed.
+ */
+static int runCommand(const std::vector<std::string>& args, const std::string& input) {
+    std::vector<char*> argv;
+    argv.reserve(args.size() + 1);
+    for (const auto& arg : args) argv.push_back(const_cast<char*>(arg.c_str()));
+    argv.push_back(nullptr);
+
+    int fds[2];
+    if (pipe(fds) != 0) {
+        std::cerr << "Failed to run " << args[0] << ": " << std::strerror(errno) << "\n";
+        return -1;
+    }
+
+    posix_spawn_file_actions_t actions;
+    posix_spawn_file_actions_init(&actions);
+    posix_spawn_file_actions_adddup2(&actions, fds[0], STDIN_FILENO);
+    posix_spawn_file_actions_addclose(&actions, fds[0]);
+    posix_spawn_file_actions_addclose(&actions, fds[1]);
+
+    // main() ignores SIGPIPE, and ignored signals survive exec: restore the default
+    // disposition so the program and anything it launches behave as usual
+    posix_spawnattr_t attr;
+    posix_spawnattr_init(&attr);
+    sigset_t defaultSignals;
+    sigemptyset(&defaultSignals);
+    sigaddset(&defaultSignals, SIGPIPE);
+    posix_spawnattr_setsigdefault(&attr, &defaultSignals);
+    posix_spawnattr_setflags(&attr, POSIX_SPAWN_SETSIGDEF);
+
+    pid_t pid;
+    int err = posix_spawnp(&pid, argv[0], &actions, &attr, argv.data(), environ);
+    posix_spawnattr_destroy(&attr);
+    posix_spawn_file_actions_destroy(&actions);
+    close(fds[0]);
+    if (err != 0) {
+        close(fds[1]);
+        std::cerr << "Failed to run " << args[0] << ": " << std::strerror(err) << "\n";
+        return -1;
+    }
+
+    // SIGPIPE is ignored in main(), so a program that exits early shows up as EPIPE here
+    size_t written = 0;
+    int writeError = 0;
+    while (written < input.size()) {
+        ssize_t n = write(fds[1], input.data() + written, input.size() - written);
+        if (n < 0) {
+            if (errno == EINTR) continue;
+            writeError = errno;
+            break;
+        }
+        written += static_cast<size_t>(n);
+    }
+    close(fds[1]);
+
+    int status;
+    while (waitpid(pid, &status, 0) < 0) {
+        if (errno != EINTR) return -1;
+    }
+
+    if (writeError != 0) {
+        std::cerr << "Failed to send input to " << args[0] << " (" << written << " of "
+                  << input.size() << " bytes written): " << std::strerror(writeError) << "\n";
+        return -1;
+    }
+    return WIFEXITED(status) ? WEXITSTATUS(status) : -1;
+}
+
+/**
+ * @brief Derives the executable name from a source path by stripping its directory and extension.
+ */
+static std::string executableName(const std::string& filepath) {
+    std::string exec_name = filepath;
+    size_t last_slash = exec_name.find_last_of("/\\");
+    if (last_slash != std::string::npos)
+        exec_name = exec_name.substr(last_slash + 1);
+    size_t dot_pos = exec_name.rfind('.');
+    if (dot_pos != std::string::npos)
+        exec_name = exec_name.substr(0, dot_pos);
+    return exec_name;
+}
+
+/**
+ * @brief Compiles and links a single source file into an executable.
+ *
+ * The executable is named after the source file without its directory and extension.
+ *
+ * The assembly is piped to clang's standard input, so no intermediate .s file is written.
+ *
+ * @param filepath Path of the source file.
+ * @param compilerPath Path used to invoke the compiler (argv[0]), used to key the asm cache.
+ * @return 0 on success, 1 on failure.
+ */
+static int compileFile(const std::string& filepath, const char* compilerPath) {
+    try {
+        std::cout << "Full compilation of: " << filepath << "\n";
+
+        // Unchanged sources reuse the assembly generated by a previous run
+        std::string source = readSourceFile(filepath);
+        std::string cachePath = asmCachePath(source, compilerPath);
+
+        std::string assembly;
+        if (loadCachedASM(cachePath, source, compilerPath, assembly)) {
+            std::cout << "Source unchanged, reusing cached assembly.\n";
+        } else {
+            auto lex = lexSource(source, false);
+            Parser parser(lex, false);
+            auto ast = parser.parseProgram();
+            resolve_program(ast.get());
+
+            Lowerer lowerer;
+            auto tackyProgram = lowerer.lower(ast.get());
+
+            ASDLProgram asdlProgram = convertTackyToASDL(*tackyProgram);
+            finalizeASDL(asdlProgram);
+
+            assembly = generateASM(asdlProgram);
+            storeCachedASM(cachePath, source, compilerPath, assembly);
+        }
+
+        int result = runCommand({"clang", "-arch", "x86_64", "-x", "assembler", "-", "-o", executableName(filepath)},
+                                assembly);
+        if (result != 0) {
+            std::cerr << "Linking failed.\n";
+            return 1;
+        }
+
+        std::cout << "Compilation succeeded. Executable is '" << executableName(filepath) << "'\n";
+    } catch (const std::runtime_error& e) {
+        std::cerr << "Error: " << e.what() << "\n";
+        return 1;
+    }
+    return 0;
+}
+
+/**
+ * @brief Compiles several source files in parallel, one child process per file.
+ *
+ * At most std::thread::hardware_concurrency() files are compiled at a time.
+ * Nothing is compiled if two sources would produce an executable with the same name.
+ *
+ * @param filepaths Paths of the source files.
+ * @param compilerPath Path used to invoke the compiler (argv[0]).
+ * @return 0 if every file compiled successfully, 1 otherwise.
+ */
+static int compileFiles(const std::vector<std::string>& filepaths, const char* compilerPath) {
+    // Executables are named after the source's base name, so two sources such as
+    // x/m.c and y/m.c would race to write the same ./m
+    std::unordered_map<std::string, std::string> outputs;
+    for (const auto& filepath : filepaths) {
+        auto [it, inserted] = outputs.emplace(executableName(filepath), filepath);
+        if (!inserted) {
+            std::cerr << "Error: '" << it->second << "' and '" << filepath
+                      << "' would both produce the executable '" << it->first << "'\n";
+            return 1;
+        }
+    }
+
+    size_t maxWorkers = std::max(1u, std::thread::hardware_concurrency());
+    size_t running = 0;
+    int status = 0;
+
+    auto reapOne = [&]() {
+        int childStatus;
+        pid_t pid;
+        while ((pid = wait(&childStatus)) < 0 && errno == EINTR) {}
+        if (pid < 0) return;
+        --running;
+        if (!WIFEXITED(childStatus) || WEXITSTATUS(childStatus) != 0) status = 1;
+    };
+
+    for (const auto& filepath : filepaths) {
+        if (running == maxWorkers) reapOne();
+
+        // Flush buffered output so the child does not print it a second time
+        std::cout.flush();
+        std::cerr.flush();
+
+        pid_t pid = fork();
+        if (pid < 0) {
+            std::cerr << "Failed to start compilation of " << filepath << ": " << std::strerror(errno) << "\n";
+            status = 1;
+            continue;
+        }
+        if (pid == 0) {
+            int result = compileFile(filepath, compilerPath);
+            std::cout.flush();
+            std::cerr.flush();
+            _exit(result);
+        }
+        ++running;
+    }
+
+    while (running > 0) reapOne();
+    return status;
+}
 
 void print_help() {
     std::cout << "Usage:\n";
@@ -21,21 +238,28 @@ void print_help() {
     std::cout << "  ./compiler --validate <source_file> # Run semantic validation\n";
     std::cout << "  ./compiler --tacky <source_file>    # Lower to TACKY intermediate code and print\n";
     std::cout << "  ./compiler --codegen <source_file>  # Generate assembly from parsed AST\n";
+    std::cout << "  ./compiler --asm <source_file>      # Print only the final assembly, ready to assemble\n";
     std::cout << "  ./compiler <source_file>            # Compile and link (default behavior)\n";
+    std::cout << "  ./compiler <source_file> <source_file>...  # Compile and link several files in parallel\n";
     std::cout << "  ./compiler --help                   # Show this help message\n";
 }
 
 int main(int argc, char* argv[]) {
+    // Write errors on pipes to child processes are reported through errno instead
+    signal(SIGPIPE, SIG_IGN);
+
     std::string filepath;
     std::string mode;
 
-    if (argc == 2) {
-        if (std::string(argv[1]) == "--help") {
-            print_help();
-            return 0;
-        }
-        mode = "--compile";
-        filepath = argv[1];
+    if (argc == 2 && std::string(argv[1]) == "--help") {
+        print_help();
+        return 0;
+    } else if (argc == 2) {
+        return compileFile(argv[1], argv[0]);
+    } else if (argc > 2 && std::none_of(argv + 1, argv + argc, [](const char* arg) {
+                   return std::string(arg).rfind("--", 0) == 0;
+               })) {
+        return compileFiles(std::vector<std::string>(argv + 1, argv + argc), argv[0]);
     } else if (argc == 3) {
         mode = argv[1];
         filepath = argv[2];
@@ -95,20 +319,19 @@ int main(int argc, char* argv[]) {
             auto tackyProgram = lowerer.lower(ast.get());
 
             ASDLProgram asdlProgram = convertTackyToASDL(*tackyProgram);
-            int stackOffset = replacePseudosWithStack(asdlProgram);  
-            insertAllocateStack(asdlProgram,-stackOffset);
-            legalizeMovMemoryToMemory(asdlProgram);
+            int stackOffset = finalizeASDL(asdlProgram);
 
             std::cout << "\nGenerated ASDL:\n";
-            std::cout << asdlProgram.toString() << "\n";
+            asdlProgram.printTo(std::cout);
+            std::cout << "\n";
 
             std::cout << "\nGenerated Assembly:\n";
-            std::cout << asdlProgram.toASM() << "\n";
+            asdlProgram.writeASM(std::cout);
+            std::cout << "\n";
 
             std::cout << "stackoffset value = " << stackOffset << std::endl;
 
-        } else if (mode == "--compile") {
-            std::cout << "Full compilation of: " << filepath << "\n";
+        } else if (mode == "--asm") {
             auto lex = lexer(filepath, false);
             Parser parser(lex, false);
             auto ast = parser.parseProgram();
@@ -118,34 +341,13 @@ int main(int argc, char* argv[]) {
             auto tackyProgram = lowerer.lower(ast.get());
 
             ASDLProgram asdlProgram = convertTackyToASDL(*tackyProgram);
-            int stackOffset = replacePseudosWithStack(asdlProgram);
-            insertAllocateStack(asdlProgram, -stackOffset); 
-            legalizeMovMemoryToMemory(asdlProgram);
-
-            const std::string asm_filename = "out.s";
-            try {
-                writeASMToFile(asdlProgram, asm_filename);
-            } catch (const std::exception& e) {
-                std::cerr << "Error while writing assembly: " << e.what() << "\n";
-                return 1;
-            }
+            finalizeASDL(asdlProgram);
 
-            std::string exec_name = filepath;
-            size_t last_slash = exec_name.find_last_of("/\\");
-            if (last_slash != std::string::npos)
-                exec_name = exec_name.substr(last_slash + 1);
-            size_t dot_pos = exec_name.rfind('.');
-            if (dot_pos != std::string::npos)
-                exec_name = exec_name.substr(0, dot_pos);
-
-            std::string command = "clang -arch x86_64 -o " + exec_name + " out.s";
-            int result = system(command.c_str());
-            if (result != 0) {
-                std::cerr << "Linking failed.\n";
-                return 1;
-            }
+            // Exactly the text piped to clang when compiling
+            std::cout << generateASM(asdlProgram);
 
-            std::cout << "Compilation succeeded. Executable is '" << exec_name << "'\n";
+        } else if (mode == "--compile") {
+            return compileFile(filepath, argv[0]);
         } else {
             std::cerr << "Unknown option: " << mode << "\n";
             print_help();
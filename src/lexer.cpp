@@ -22,10 +22,11 @@
 
 #include <iostream>
 #include <fstream>
+#include <filesystem>
+#include <cstdint>
 #include <sstream>
 #include <vector>
 #include <string>
-#include <regex>
 #include <stdexcept>
 #include <algorithm> 
 
@@ -34,10 +35,12 @@
 /**
  * @brief Converts a Token enum value to a human-readable string.
  * 
+ * The names are static string literals, so no string is allocated per call.
+ *
  * @param t The token type to convert.
- * @return std::string A string representing the token type.
+ * @return const char* A string representing the token type.
  */
-std::string tokenToString(Token t) {
+const char* tokenToString(Token t) {
     switch (t) {
         case Token::IDENTIFIER: return "IDENTIFIER";
         case Token::CONSTANT: return "CONSTANT";
@@ -83,73 +86,147 @@ std::string tokenToString(Token t) {
 }
 
 /**
- * @brief Determines the token type for a given word string.
+ * @brief Character classes used by the scanner.
  * 
- * Matches keywords, punctuation, identifiers, constants, comments, and whitespace using regex.
- * Returns Token::MISMATCH if the input does not match any known token pattern.
+ * C source is tokenized as plain ASCII: these checks do not depend on the
+ * current locale (unlike std::isalpha and friends) and treat any byte outside
+ * the ASCII ranges as an invalid character.
+ */
+static inline bool isDigit(char c) {
+    return c >= '0' && c <= '9';
+}
+
+static inline bool isIdentifierStart(char c) {
+    return (c >= 'a' && c <= 'z') || (c >= 'A' && c <= 'Z') || c == '_';
+}
+
+static inline bool isIdentifierChar(char c) {
+    return isIdentifierStart(c) || isDigit(c);
+}
+
+/**
+ * @brief Classifies an identifier-shaped word as a keyword or a plain identifier.
+ * 
+ * Keywords are recognised by switching on the word length first, which leaves
+ * at most two candidates to compare against and avoids hashing every identifier.
  * 
- * @param word The input string to classify.
- * @return Token The corresponding token type.
+ * @param word The scanned word (letters, digits and underscores).
+ * @return Token The keyword token, or Token::IDENTIFIER if the word is not reserved.
  */
-Token wordToToken(const std::string& word) {
-    if (word == "int")      return Token::INT;
-    if (word == "void")     return Token::VOID;
-    if (word == "return")   return Token::RETURN;
-    if (word == "(")        return Token::OPARENTHESIS;
-    if (word == ")")        return Token::CPARENTHESIS;
-    if (word == "{")        return Token::OBRACE;
-    if (word == "}")        return Token::CBRACE;
-    if (word == ";")        return Token::SEMICOLON;
-    if (word == "~")        return Token::COMPLEMENT;
-    if (word == "--")       return Token::DECREMENT;
-    if (word == "-")        return Token::NEGATION;
-    if (word == "+")        return Token::ADDITION;
-    if (word == "*")        return Token::MULTIPLICATION;
-    if (word == "/")        return Token::DIVISION;
-    if (word == "%")        return Token::REMAINDER;
-    if (word == "&&")       return Token::AND;
-    if (word == "||")       return Token::OR;
-    if (word == "==")       return Token::EQUAL;
-    if (word == "!=")       return Token::NOTEQUAL;
-    if (word == "!")        return Token::NOT;
-    if (word == "<")        return Token::LESS;
-    if (word == ">")        return Token::GREATER;
-    if (word == "<=")       return Token::LESSEQ;
-    if (word == ">=")       return Token::GREATEREQ;
-    if (word == "=")        return Token::ASSIGN;
-    if (word == "if")       return Token::IF;
-    if (word == "else")     return Token::ELSE;
-    if (word == ":")        return Token::COLON;
-    if (word == "?")        return Token::QUESTION_MARK;
-    if (word == "do")       return Token::DO;
-    if (word == "while")       return Token::WHILE;
-    if (word == "for")       return Token::FOR;
-    if (word == "continue")       return Token::CONTINUE;
-    if (word == "break")       return Token::BREAK;
+static Token keywordToken(const std::string& word) {
+    switch (word.size()) {
+        case 2:
+            if (word == "if")       return Token::IF;
+            if (word == "do")       return Token::DO;
+            break;
+        case 3:
+            if (word == "int")      return Token::INT;
+            if (word == "for")      return Token::FOR;
+            break;
+        case 4:
+            if (word == "void")     return Token::VOID;
+            if (word == "else")     return Token::ELSE;
+            break;
+        case 5:
+            if (word == "while")    return Token::WHILE;
+            if (word == "break")    return Token::BREAK;
+            break;
+        case 6:
+            if (word == "return")   return Token::RETURN;
+            break;
+        case 8:
+            if (word == "continue") return Token::CONTINUE;
+            break;
+    }
+    return Token::IDENTIFIER;
+}
 
-    if (std::regex_match(word, std::regex(R"(\d+)"))) 
-        return Token::CONSTANT;
+/**
+ * @brief Throws a lexical error for an invalid token.
+ * 
+ * @param token The offending source text.
+ * @param lineNumber Line where the token starts.
+ * @param position Index of the token in the token stream.
+ * @throws std::runtime_error Always.
+ */
+[[noreturn]] static void lexicalError(const std::string& token, int lineNumber, int position) {
+    std::ostringstream oss;
+    oss << "Lexical error: invalid token '" << token
+        << "' at line " << lineNumber
+        << ", position " << position;
+    throw std::runtime_error(oss.str());
+}
 
-    if (std::regex_match(word, std::regex(R"([a-zA-Z_]\w*)"))) 
-        return Token::IDENTIFIER;
+/**
+ * @brief Reads a source file into memory.
+ * 
+ * The file is opened in binary mode. Regular files are read with a single call
+ * into a buffer sized up front; other files such as pipes are read until end of
+ * stream. No newline translation is needed: the scanner treats '\r' as
+ * whitespace, so Windows line endings are handled like Unix ones.
+ * 
+ * @param filename The path to the source file.
+ * @return std::string The full contents of the file.
+ * 
+ * @throws std::runtime_error If the file cannot be opened or read.
+ */
+std::string readSourceFile(const std::string& filename) {
+    std::error_code ec;
+    if (std::filesystem::is_directory(filename, ec)) {
+        throw std::runtime_error("Error reading file: " + filename + ": Is a directory");
+    }
 
-    if (std::regex_match(word, std::regex(R"(^\s+$)"))) 
-        return Token::SKIP;
+    std::ifstream file(filename, std::ios::binary);
+    if (!file.is_open()) {
+        throw std::runtime_error("Error opening file: " + filename);
+    }
 
-    if (std::regex_match(word, std::regex(R"(//.*)"))) 
-        return Token::COMMENT;
+    std::string input;
+    std::uintmax_t size = 0;
+    bool sized = std::filesystem::is_regular_file(filename, ec);
+    if (sized) {
+        size = std::filesystem::file_size(filename, ec);
+        sized = !ec && size < input.max_size();
+    }
 
-    if (std::regex_match(word, std::regex(R"(/\*.*\*/)"))) 
-        return Token::ML_COMMENT;
+    if (sized) {
+        input.resize(static_cast<size_t>(size));
+        file.read(&input[0], static_cast<std::streamsize>(size));
+        if (file.bad()) {
+            throw std::runtime_error("Error reading file: " + filename);
+        }
+        // The file may have shrunk since it was sized
+        input.resize(static_cast<size_t>(file.gcount()));
+    } else {
+        // Not a regular file (e.g. a pipe or /dev/stdin): read until end of stream
+        input.assign(std::istreambuf_iterator<char>(file), std::istreambuf_iterator<char>());
+    }
 
-    return Token::MISMATCH;
+    return input;
 }
 
 /**
  * @brief Performs lexical analysis on the given source file.
  * 
- * Reads the entire file contents, then repeatedly matches and extracts tokens
- * according to predefined regular expression patterns. Skips whitespace and comments.
+ * Reads the file with readSourceFile() and tokenizes it with lexSource().
+ * 
+ * @param filename The path to the source file to lex.
+ * @param verbose If true, prints all tokens with their types, positions, and lines.
+ * @return std::vector<Lex> A vector of Lex objects representing the tokens found.
+ * 
+ * @throws std::runtime_error If the file cannot be opened or if a lexical error occurs.
+ */
+std::vector<Lex> lexer(const std::string& filename, bool verbose) {
+    return lexSource(readSourceFile(filename), verbose);
+}
+
+/**
+ * @brief Performs lexical analysis on source code already held in memory.
+ * 
+ * Scans the input once from left to right, dispatching on the current character:
+ * whitespace, comments and preprocessor lines are skipped, words are classified as
+ * keywords or identifiers, digit runs become constants and operators are recognised
+ * directly (including two-character operators such as "&&" or "<=").
  * Throws an exception if an invalid token is encountered.
  * 
  * The recognized tokens include identifiers, constants, keywords (int, void, return),
@@ -159,133 +236,128 @@ Token wordToToken(const std::string& word) {
  * This function also tracks the line number for each token and stores it in the Lex struct,
  * so that errors or debug info can reference the exact line.
  * 
- * @param filename The path to the source file to lex.
+ * @param input The source code to lex.
  * @param verbose If true, prints all tokens with their types, positions, and lines.
  * @return std::vector<Lex> A vector of Lex objects representing the tokens found.
  * 
- * @throws std::runtime_error If the file cannot be opened or if a lexical error occurs.
+ * @throws std::runtime_error If a lexical error occurs.
  */
-std::vector<Lex> lexer(const std::string& filename, bool verbose) {
-    std::ifstream file(filename);
-    if (!file.is_open()) {
-        throw std::runtime_error("Error opening file: " + filename);
-    }
-
-    // Read entire file content into a string
-    std::string input((std::istreambuf_iterator<char>(file)), std::istreambuf_iterator<char>());
-
-    // Normalize newlines (remove '\r' if present)
-    input.erase(std::remove(input.begin(), input.end(), '\r'), input.end());
-
+std::vector<Lex> lexSource(const std::string& input, bool verbose) {
     std::vector<Lex> lexemes;  // Vector to hold tokens
     int position = 0;          // Position index of tokens
     int lineNumber = 1;        // Current line number in source code
 
-    // Patterns for different token types in priority order
-    std::vector<std::pair<std::regex, Token>> patterns = {
-        {std::regex(R"(^#[^\n]*)"), Token::SKIP},
-        {std::regex(R"(^//[^\n]*)"), Token::COMMENT},
-        {std::regex(R"(^/\*([^*]|\*+[^*/])*\*+/)"), Token::ML_COMMENT},
-        {std::regex(R"(^\()"), Token::OPARENTHESIS},
-        {std::regex(R"(^\))"), Token::CPARENTHESIS},
-        {std::regex(R"(^\{)"), Token::OBRACE},
-        {std::regex(R"(^\})"), Token::CBRACE},
-        {std::regex(R"(^;)"), Token::SEMICOLON},
-        {std::regex(R"(^~)"), Token::COMPLEMENT},
-        {std::regex(R"(^--)"), Token::DECREMENT},
-        {std::regex(R"(^-)"), Token::NEGATION},
-        {std::regex(R"(^\+)"), Token::ADDITION},
-        {std::regex(R"(^\*)"), Token::MULTIPLICATION},
-        {std::regex(R"(^\/)"), Token::DIVISION},
-        {std::regex(R"(^\%)"), Token::REMAINDER},
-        {std::regex(R"(^&&)"), Token::AND},
-        {std::regex(R"(^\|\|)"), Token::OR},
-        {std::regex(R"(^==)"), Token::EQUAL},
-        {std::regex(R"(^!=)"), Token::NOTEQUAL},
-        {std::regex(R"(^!)"), Token::NOT},
-        {std::regex(R"(^<=)"), Token::LESSEQ},
-        {std::regex(R"(^>=)"), Token::GREATEREQ},
-        {std::regex(R"(^<)"), Token::LESS},
-        {std::regex(R"(^>)"), Token::GREATER},
-        {std::regex(R"(^\d+[a-zA-Z_]\w*)"), Token::MISMATCH}, // invalid token like 123abc
-        {std::regex(R"(^\bif\b)"), Token::IF},
-        {std::regex(R"(^\belse\b)"), Token::ELSE},
-        {std::regex(R"(^\bint\b)"), Token::INT},
-        {std::regex(R"(^\bvoid\b)"), Token::VOID},
-        {std::regex(R"(^\breturn\b)"), Token::RETURN},
-        {std::regex(R"(^\bdo\b)"), Token::DO},
-        {std::regex(R"(^\bfor\b)"), Token::FOR},
-        {std::regex(R"(^\bwhile\b)"), Token::WHILE},
-        {std::regex(R"(^\bcontinue\b)"), Token::CONTINUE},
-        {std::regex(R"(^\bbreak\b)"), Token::BREAK},
-        {std::regex(R"(^[a-zA-Z_]\w*)"), Token::IDENTIFIER},
-        {std::regex(R"(^\d+)"), Token::CONSTANT},
-        {std::regex(R"(^\s+)"), Token::SKIP},
-        {std::regex(R"(^=)"), Token::ASSIGN},
-        {std::regex(R"(^:)"), Token::COLON},
-        {std::regex(R"(^\?)"), Token::QUESTION_MARK},
-        {std::regex(R"(^\S)"), Token::MISMATCH},
-    };
-
-    // Process input until fully consumed
-    while (!input.empty()) {
-        std::smatch match;
-        bool matched = false;
-
-        // Try each pattern in order to find a match at start of input
-        for (const auto& [regex, tokenType] : patterns) {
-            if (std::regex_search(input, match, regex)) {
-                std::string token = match.str(0);
-
-                // Skip whitespace and comments without adding tokens, but update line count
-                if (tokenType == Token::SKIP || tokenType == Token::COMMENT || tokenType == Token::ML_COMMENT) {
-                    // Count newlines in skipped text to keep line count accurate
-                    lineNumber += std::count(token.begin(), token.end(), '\n');
-                    input.erase(0, token.length());
-                    matched = true;
-                    break;
-                }
+    const size_t length = input.size();
+    size_t pos = 0;            // Current offset in the input
 
-                // Determine actual token for identifiers, constants, or mismatches
-                Token actualToken = tokenType;
-                if (tokenType == Token::IDENTIFIER || tokenType == Token::CONSTANT || tokenType == Token::MISMATCH) {
-                    actualToken = wordToToken(token);
-                }
+    // Typical C source has about one token per eight bytes or fewer; reserving that
+    // up front avoids most reallocations, and the vector still grows for denser input
+    lexemes.reserve(length / 8 + 16);
 
-                if (actualToken == Token::MISMATCH) {
+    while (true) {
+        // Skip any run of whitespace, comments and preprocessor lines in one go,
+        // checking whitespace first since it is by far the most common
+        while (pos < length) {
+            const char c = input[pos];
+            if (c == ' ' || c == '\t' || c == '\n' || c == '\v' || c == '\f' || c == '\r') {
+                if (c == '\n') ++lineNumber;
+                ++pos;
+            } else if (c == '#' || (c == '/' && pos + 1 < length && input[pos + 1] == '/')) {
+                // Preprocessor directives and line comments run to the end of the line;
+                // find() jumps there with a single memchr instead of a per-character loop
+                size_t eol = input.find('\n', pos);
+                pos = (eol == std::string::npos) ? length : eol;
+            } else if (c == '/' && pos + 1 < length && input[pos + 1] == '*') {
+                size_t end = input.find("*/", pos + 2);
+                if (end == std::string::npos) {
                     std::ostringstream oss;
-                    oss << "Lexical error: invalid token '" << token
-                        << "' at line " << lineNumber
-                        << ", position " << position;
+                    oss << "Lexical error: unterminated comment at line " << lineNumber;
                     throw std::runtime_error(oss.str());
                 }
+                lineNumber += std::count(input.begin() + pos, input.begin() + end, '\n');
+                pos = end + 2;
+            } else {
+                break;
+            }
+        }
 
-                // Count newlines in the matched token to update line number
-                int newlines = std::count(token.begin(), token.end(), '\n');
+        if (pos >= length) break;
 
-                // Store the current line number for this token
-                int tokenLine = lineNumber;
+        const char c = input[pos];
+        const char next = (pos + 1 < length) ? input[pos + 1] : '\0';
+        const size_t start = pos;
+        Token tokenType;
 
-                // Update lineNumber for the next token
-                lineNumber += newlines;
+        switch (c) {
+            case '/': tokenType = Token::DIVISION;       ++pos; break;
+            case '(': tokenType = Token::OPARENTHESIS;   ++pos; break;
+            case ')': tokenType = Token::CPARENTHESIS;   ++pos; break;
+            case '{': tokenType = Token::OBRACE;         ++pos; break;
+            case '}': tokenType = Token::CBRACE;         ++pos; break;
+            case ';': tokenType = Token::SEMICOLON;      ++pos; break;
+            case '~': tokenType = Token::COMPLEMENT;     ++pos; break;
+            case '+': tokenType = Token::ADDITION;       ++pos; break;
+            case '*': tokenType = Token::MULTIPLICATION; ++pos; break;
+            case '%': tokenType = Token::REMAINDER;      ++pos; break;
+            case ':': tokenType = Token::COLON;          ++pos; break;
+            case '?': tokenType = Token::QUESTION_MARK;  ++pos; break;
 
-                // Add the token with line and position info
-                lexemes.push_back({token, actualToken, position++, tokenLine});
+            case '-':
+                tokenType = (next == '-') ? Token::DECREMENT : Token::NEGATION;
+                pos += (next == '-') ? 2 : 1;
+                break;
+            case '=':
+                tokenType = (next == '=') ? Token::EQUAL : Token::ASSIGN;
+                pos += (next == '=') ? 2 : 1;
+                break;
+            case '!':
+                tokenType = (next == '=') ? Token::NOTEQUAL : Token::NOT;
+                pos += (next == '=') ? 2 : 1;
+                break;
+            case '<':
+                tokenType = (next == '=') ? Token::LESSEQ : Token::LESS;
+                pos += (next == '=') ? 2 : 1;
+                break;
+            case '>':
+                tokenType = (next == '=') ? Token::GREATEREQ : Token::GREATER;
+                pos += (next == '=') ? 2 : 1;
+                break;
+            case '&':
+                if (next != '&') lexicalError("&", lineNumber, position);
+                tokenType = Token::AND;
+                pos += 2;
+                break;
+            case '|':
+                if (next != '|') lexicalError("|", lineNumber, position);
+                tokenType = Token::OR;
+                pos += 2;
+                break;
 
-                // Remove matched token from input
-                input.erase(0, token.length());
-                matched = true;
+            default:
+                if (isIdentifierStart(c)) {
+                    // Identifier or keyword
+                    while (pos < length && isIdentifierChar(input[pos])) ++pos;
+                    tokenType = Token::IDENTIFIER;
+                } else if (isDigit(c)) {
+                    // Integer constant; a word starting with digits (e.g. 123abc) is invalid
+                    while (pos < length && isDigit(input[pos])) ++pos;
+                    if (pos < length && isIdentifierStart(input[pos])) {
+                        while (pos < length && isIdentifierChar(input[pos])) ++pos;
+                        lexicalError(input.substr(start, pos - start), lineNumber, position);
+                    }
+                    tokenType = Token::CONSTANT;
+                } else {
+                    lexicalError(std::string(1, c), lineNumber, position);
+                }
                 break;
-            }
         }
 
-        // If no pattern matched, this is a lexical error
-        if (!matched) {
-            std::ostringstream oss;
-            oss << "Lexical error: could not match input at line "
-                << lineNumber << ", position " << position;
-            throw std::runtime_error(oss.str());
-        }
+        // Add the token with line and position info, building its text in place
+        Lex& lex = lexemes.emplace_back();
+        lex.word.assign(input, start, pos - start);
+        lex.token = tokenType == Token::IDENTIFIER ? keywordToken(lex.word) : tokenType;
+        lex.position = position++;
+        lex.line = lineNumber;
     }
 
     // If verbose, print all tokens with their word, type, position, and line number
@@ -298,5 +370,10 @@ std::vector<Lex> lexer(const std::string& filename, bool verbose) {
         }
     }
 
+    // Comment-heavy input leaves most of the reservation unused; give it back
+    if (lexemes.capacity() > 2 * lexemes.size() + 16) {
+        lexemes.shrink_to_fit();
+    }
+
     return lexemes;
 }
@@ -1,8 +1,9 @@
 #pragma once
 #include <string>
 #include <vector>
+#include <cstdint>
 
-enum class Token {
+enum class Token : std::uint8_t {
     IDENTIFIER, CONSTANT, INT, VOID, RETURN,
     OPARENTHESIS, CPARENTHESIS, OBRACE, CBRACE, SEMICOLON, SKIP, COMMENT, ML_COMMENT, MISMATCH, COMPLEMENT,
     NEGATION, DECREMENT, ADDITION, MULTIPLICATION, DIVISION, REMAINDER, NOT, AND, OR, EQUAL, NOTEQUAL,
@@ -23,6 +24,8 @@ struct Lex {
     int line;           
 };
 
+std::string readSourceFile(const std::string& filename);
+std::vector<Lex> lexSource(const std::string& input, bool verbose = true);
 std::vector<Lex> lexer(const std::string& filename, bool verbose = true);
-std::string tokenToString(Token t);
+const char* tokenToString(Token t);
 
@@ -32,164 +32,161 @@ tacky::BinaryOp Lowerer::toTackyBinaryOp(BinaryOpast op) {
 }
 
 std::unique_ptr<tacky::Val> Lowerer::lowerExpression(const Expression* expr) {
-    // Binary operation
-    if (expr->operand1 && expr->operand2) {
-        if (expr->bin_op == BinaryOpast::AND) {
-            auto v1 = lowerExpression(expr->operand1.get());
-            std::string result = newTemp();
-            std::string falseLabel = newLabel("false");
-            std::string endLabel = newLabel("end");
-
-            instructions.push_back(std::make_unique<tacky::JumpIfZero>(
-                std::move(v1), falseLabel
-            ));
-
-            auto v2 = lowerExpression(expr->operand2.get());
-            instructions.push_back(std::make_unique<tacky::JumpIfZero>(
-                std::move(v2), falseLabel
-            ));
-
-            instructions.push_back(std::make_unique<tacky::Copy>(
-                std::make_unique<tacky::Constant>(1),
-                std::make_unique<tacky::Var>(result)
-            ));
-            instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
+    switch (expr->type) {
+        case ExpressionType::BINARY: {
+            if (expr->bin_op == BinaryOpast::AND) {
+                auto v1 = lowerExpression(expr->operand1.get());
+                std::string result = newTemp();
+                std::string falseLabel = newLabel("false");
+                std::string endLabel = newLabel("end");
+
+                instructions.push_back(std::make_unique<tacky::JumpIfZero>(
+                    std::move(v1), falseLabel
+                ));
+
+                auto v2 = lowerExpression(expr->operand2.get());
+                instructions.push_back(std::make_unique<tacky::JumpIfZero>(
+                    std::move(v2), falseLabel
+                ));
+
+                instructions.push_back(std::make_unique<tacky::Copy>(
+                    std::make_unique<tacky::Constant>(1),
+                    std::make_unique<tacky::Var>(result)
+                ));
+                instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
 
-            instructions.push_back(std::make_unique<tacky::Label>(falseLabel));
-            instructions.push_back(std::make_unique<tacky::Copy>(
-                std::make_unique<tacky::Constant>(0),
-                std::make_unique<tacky::Var>(result)
-            ));
+                instructions.push_back(std::make_unique<tacky::Label>(falseLabel));
+                instructions.push_back(std::make_unique<tacky::Copy>(
+                    std::make_unique<tacky::Constant>(0),
+                    std::make_unique<tacky::Var>(result)
+                ));
 
-            instructions.push_back(std::make_unique<tacky::Label>(endLabel));
+                instructions.push_back(std::make_unique<tacky::Label>(endLabel));
 
-            return std::make_unique<tacky::Var>(result);
-        }
+                return std::make_unique<tacky::Var>(result);
+            }
 
-        if (expr->bin_op == BinaryOpast::OR) {
-            auto v1 = lowerExpression(expr->operand1.get());
-            std::string result = newTemp();
-            std::string trueLabel = newLabel("true");
-            std::string endLabel = newLabel("end");
+            if (expr->bin_op == BinaryOpast::OR) {
+                auto v1 = lowerExpression(expr->operand1.get());
+                std::string result = newTemp();
+                std::string trueLabel = newLabel("true");
+                std::string endLabel = newLabel("end");
+
+                instructions.push_back(std::make_unique<tacky::JumpIfNotZero>(
+                    std::move(v1), trueLabel
+                ));
+
+                auto v2 = lowerExpression(expr->operand2.get());
+                instructions.push_back(std::make_unique<tacky::JumpIfNotZero>(
+                    std::move(v2), trueLabel
+                ));
+
+                instructions.push_back(std::make_unique<tacky::Copy>(
+                    std::make_unique<tacky::Constant>(0),
+                    std::make_unique<tacky::Var>(result)
+                ));
+                instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
 
-            instructions.push_back(std::make_unique<tacky::JumpIfNotZero>(
-                std::move(v1), trueLabel
-            ));
+                instructions.push_back(std::make_unique<tacky::Label>(trueLabel));
+                instructions.push_back(std::make_unique<tacky::Copy>(
+                    std::make_unique<tacky::Constant>(1),
+                    std::make_unique<tacky::Var>(result)
+                ));
 
-            auto v2 = lowerExpression(expr->operand2.get());
-            instructions.push_back(std::make_unique<tacky::JumpIfNotZero>(
-                std::move(v2), trueLabel
-            ));
+                instructions.push_back(std::make_unique<tacky::Label>(endLabel));
 
-            instructions.push_back(std::make_unique<tacky::Copy>(
-                std::make_unique<tacky::Constant>(0),
-                std::make_unique<tacky::Var>(result)
-            ));
-            instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
+                return std::make_unique<tacky::Var>(result);
+            }
 
-            instructions.push_back(std::make_unique<tacky::Label>(trueLabel));
-            instructions.push_back(std::make_unique<tacky::Copy>(
-                std::make_unique<tacky::Constant>(1),
-                std::make_unique<tacky::Var>(result)
+            // Standard binary op
+            auto lhs = lowerExpression(expr->operand1.get());
+            auto rhs = lowerExpression(expr->operand2.get());
+            auto tmpName = newTemp();
+
+            tacky::BinaryOp op = toTackyBinaryOp(expr->bin_op);
+            instructions.push_back(std::make_unique<tacky::Binary>(
+                op,
+                std::move(lhs),
+                std::move(rhs),
+                std::make_unique<tacky::Var>(tmpName)
             ));
 
-            instructions.push_back(std::make_unique<tacky::Label>(endLabel));
-
-            return std::make_unique<tacky::Var>(result);
+            return std::make_unique<tacky::Var>(tmpName);
         }
 
-        // Standard binary op
-        auto lhs = lowerExpression(expr->operand1.get());
-        auto rhs = lowerExpression(expr->operand2.get());
-        auto tmpName = newTemp();
+        case ExpressionType::CONSTANT:
+            return std::make_unique<tacky::Constant>(expr->value);
 
-        tacky::BinaryOp op = toTackyBinaryOp(expr->bin_op);
-        instructions.push_back(std::make_unique<tacky::Binary>(
-            op,
-            std::move(lhs),
-            std::move(rhs),
-            std::make_unique<tacky::Var>(tmpName)
-        ));
+        case ExpressionType::VAR:
+            return std::make_unique<tacky::Var>(expr->identifier);
 
-        return std::make_unique<tacky::Var>(tmpName);
-    }
+        case ExpressionType::ASSIGNMENT: {
+            // Only the var = expr form is supported
+            if (expr->exp1->type != ExpressionType::VAR) break;
 
-    // Constant
-    if (!expr->operand && expr->type == ExpressionType::CONSTANT) {
-        return std::make_unique<tacky::Constant>(expr->value);
-    }
+            auto rhs = lowerExpression(expr->exp2.get());
+            std::string lhsName = expr->exp1->identifier;
 
-    // Variable
-    if (expr->type == ExpressionType::VAR) {
-        return std::make_unique<tacky::Var>(expr->identifier);
-    }
-
-    // Assignment (only var = expr form supported)
-    if (expr->type == ExpressionType::ASSIGNMENT && expr->exp1->type == ExpressionType::VAR) {
-        auto rhs = lowerExpression(expr->exp2.get());
-        std::string lhsName = expr->exp1->identifier;
-
-        instructions.push_back(std::make_unique<tacky::Copy>(
-            std::move(rhs),
-            std::make_unique<tacky::Var>(lhsName)
-        ));
+            instructions.push_back(std::make_unique<tacky::Copy>(
+                std::move(rhs),
+                std::make_unique<tacky::Var>(lhsName)
+            ));
 
-        return std::make_unique<tacky::Var>(lhsName);
-    }
+            return std::make_unique<tacky::Var>(lhsName);
+        }
 
-    if (expr->type == ExpressionType::CONDITIONAL) {
-        auto dst = newTemp();  // temporary variable to hold the result
+        case ExpressionType::CONDITIONAL: {
+            auto dst = newTemp();  // temporary variable to hold the result
 
-        std::string elseLabel = newLabel("cond_else");
-        std::string endLabel = newLabel("cond_end");
+            std::string elseLabel = newLabel("cond_else");
+            std::string endLabel = newLabel("cond_end");
 
-        // Lower the condition expression
-        auto condVal = lowerExpression(expr->condition.get());
+            // Lower the condition expression
+            auto condVal = lowerExpression(expr->condition.get());
 
-        // If condition is false, jump to else
-        instructions.push_back(std::make_unique<tacky::JumpIfZero>(std::move(condVal), elseLabel));
+            // If condition is false, jump to else
+            instructions.push_back(std::make_unique<tacky::JumpIfZero>(std::move(condVal), elseLabel));
 
-        // True branch: evaluate and copy to dst
-        auto trueVal = lowerExpression(expr->trueExpr.get());
-        instructions.push_back(std::make_unique<tacky::Copy>(std::move(trueVal), std::make_unique<tacky::Var>(dst)));
+            // True branch: evaluate and copy to dst
+            auto trueVal = lowerExpression(expr->trueExpr.get());
+            instructions.push_back(std::make_unique<tacky::Copy>(std::move(trueVal), std::make_unique<tacky::Var>(dst)));
 
-        instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
+            instructions.push_back(std::make_unique<tacky::Jump>(endLabel));
 
-        // Else label
-        instructions.push_back(std::make_unique<tacky::Label>(elseLabel));
+            // Else label
+            instructions.push_back(std::make_unique<tacky::Label>(elseLabel));
 
-        // False branch: evaluate and copy to dst
-        auto falseVal = lowerExpression(expr->falseExpr.get());
-        instructions.push_back(std::make_unique<tacky::Copy>(std::move(falseVal), std::make_unique<tacky::Var>(dst)));
+            // False branch: evaluate and copy to dst
+            auto falseVal = lowerExpression(expr->falseExpr.get());
+            instructions.push_back(std::make_unique<tacky::Copy>(std::move(falseVal), std::make_unique<tacky::Var>(dst)));
 
-        // End label
-        instructions.push_back(std::make_unique<tacky::Label>(endLabel));
+            // End label
+            instructions.push_back(std::make_unique<tacky::Label>(endLabel));
 
-        return std::make_unique<tacky::Var>(dst);
-    }
+            return std::make_unique<tacky::Var>(dst);
+        }
 
+        case ExpressionType::UNARY: {
+            auto src = lowerExpression(expr->operand.get());
+            auto tmpName = newTemp();
+
+            tacky::UnaryOp op;
+            switch (expr->un_op) {
+                case UnaryOpast::COMPLEMENT: op = tacky::UnaryOp::Complement; break;
+                case UnaryOpast::NEGATE:     op = tacky::UnaryOp::Negate;     break;
+                case UnaryOpast::NOT:        op = tacky::UnaryOp::Not;        break;
+                default:
+                    throw std::runtime_error("Unknown UnaryOpast in lowerExpression");
+            }
 
-    // Unary
-    if (expr->operand) {
-        auto src = lowerExpression(expr->operand.get());
-        auto tmpName = newTemp();
+            instructions.push_back(std::make_unique<tacky::Unary>(
+                op,
+                std::move(src),
+                std::make_unique<tacky::Var>(tmpName)
+            ));
 
-        tacky::UnaryOp op;
-        switch (expr->un_op) {
-            case UnaryOpast::COMPLEMENT: op = tacky::UnaryOp::Complement; break;
-            case UnaryOpast::NEGATE:     op = tacky::UnaryOp::Negate;     break;
-            case UnaryOpast::NOT:        op = tacky::UnaryOp::Not;        break;
-            default:
-                throw std::runtime_error("Unknown UnaryOpast in lowerExpression");
+            return std::make_unique<tacky::Var>(tmpName);
         }
-
-        instructions.push_back(std::make_unique<tacky::Unary>(
-            op,
-            std::move(src),
-            std::make_unique<tacky::Var>(tmpName)
-        ));
-
-        return std::make_unique<tacky::Var>(tmpName);
     }
 
     throw std::runtime_error("Unhandled expression type");
@@ -356,6 +353,10 @@ void Lowerer::lowerFunction(const Function* fn) {
 }
 
 std::unique_ptr<tacky::Program> Lowerer::lower(const Program* astProgram) {
+    if (!astProgram || !astProgram->function) {
+        throw std::runtime_error("Cannot lower a program without a function definition");
+    }
+
     auto func = std::make_unique<tacky::Function>(astProgram->function->name);
 
     lowerFunction(astProgram->function.get());
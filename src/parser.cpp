@@ -4,7 +4,12 @@
 #include <iostream>
 
 // Constructor
-Parser::Parser(const std::vector<Lex>& t, bool verboseMode) : tokens(t), verbose(verboseMode) {}
+Parser::Parser(const std::vector<Lex>& t, bool verboseMode) : tokens(t), verbose(verboseMode) {
+    kinds.reserve(tokens.size());
+    for (const auto& lex : tokens) {
+        kinds.push_back(lex.token);
+    }
+}
 
 // Error handling
 [[noreturn]] void Parser::error(const std::string& message, const Lex& token) {
@@ -21,45 +26,43 @@ void Parser::log(const std::string& message) {
 }
 
 // Token helpers
-Lex Parser::peek() {
-    if (current < tokens.size()) {
-        return tokens[current];
-    } else {
-        return Lex{"", Token::MISMATCH, -1};
-    }
+void Parser::logToken(const char* action, const Lex& token) {
+    log(action + token.word + " (line " + std::to_string(token.line) + ")");
 }
 
-Lex Parser::advance() {
-    if (current < tokens.size()) {
-        log("Advance token: " + tokens[current].word + " (line " + std::to_string(tokens[current].line) + ")");
-        return tokens[current++];
-    } else {
-        return Lex{"", Token::MISMATCH, -1};
+const Lex& Parser::expect(Token expected, const char* errorMsg) {
+    if (peekKind() != expected) {
+        error(errorMsg, peek());
     }
+    return advance();
 }
 
-bool Parser::match(Token t) {
-    if (current < tokens.size() && tokens[current].token == t) {
-        log("Match token: " + tokens[current].word + " (line " + std::to_string(tokens[current].line) + ")");
-        advance();
-        return true;
+size_t Parser::expectSequence(std::initializer_list<std::pair<Token, const char*>> expected) {
+    size_t start = current;
+    size_t i = start;
+    const char* failure = nullptr;
+    for (const auto& [kind, errorMsg] : expected) {
+        if (i >= kinds.size() || kinds[i] != kind) {
+            failure = errorMsg;
+            break;
+        }
+        ++i;
     }
-    return false;
-}
 
-Lex Parser::expect(Token expected, const std::string& errorMsg) {
-    Lex token = peek();
-    if (token.token != expected) {
-        error(errorMsg, token);
+    // Log the matched tokens, as the equivalent expect() calls would have done
+    if (verbose) {
+        for (size_t j = start; j < i; ++j) logToken("Advance token: ", tokens[j]);
     }
-    return advance();
+    current = i;
+    if (failure) error(failure, peek());
+    return start;
 }
 
 // Parse entry point
 std::unique_ptr<Program> Parser::parseProgram() {
     log("Parsing program");
     auto func = parseFunction();
-    if (peek().token != Token::MISMATCH) {
+    if (peekKind() != Token::MISMATCH) {
         error("Unexpected token after function", peek());
     }
     log("Parsed program successfully");
@@ -70,16 +73,18 @@ std::unique_ptr<Program> Parser::parseProgram() {
 std::unique_ptr<Function> Parser::parseFunction() {
     log("Parsing function");
 
-    expect(Token::INT, "Expected 'int' at function start");
-    expect(Token::IDENTIFIER, "Expected function name");
-    std::string funcName = tokens[current - 1].word;
-
-    expect(Token::OPARENTHESIS, "Expected '(' after function name");
-    expect(Token::VOID, "Expected 'void' in parameter list");
-    expect(Token::CPARENTHESIS, "Expected ')' after 'void'");
+    // The function header is a fixed token sequence up to the body's opening brace
+    size_t start = expectSequence({
+        {Token::INT, "Expected 'int' at function start"},
+        {Token::IDENTIFIER, "Expected function name"},
+        {Token::OPARENTHESIS, "Expected '(' after function name"},
+        {Token::VOID, "Expected 'void' in parameter list"},
+        {Token::CPARENTHESIS, "Expected ')' after 'void'"},
+        {Token::OBRACE, "Expected '{' to begin function body"},
+    });
+    std::string funcName = tokens[start + 1].word;
 
     // Parse function body as a Block
-    expect(Token::OBRACE, "Expected '{' to begin function body");
     auto block = parseBlock();  // Now responsible for consuming the closing '}'
 
     log("Parsed function '" + funcName + "' successfully");
@@ -103,7 +108,7 @@ std::unique_ptr<Block> Parser::parseBlock() {
 
 // Parse block item (statement or declaration)
 std::unique_ptr<BlockItem> Parser::parseBlockItem() {
-    if (peek().token == Token::INT) {
+    if (peekKind() == Token::INT) {
         advance(); // consume 'int'
         expect(Token::IDENTIFIER, "Expected identifier after 'int'");
         std::string name = tokens[current - 1].word;
@@ -127,7 +132,7 @@ std::unique_ptr<BlockItem> Parser::parseBlockItem() {
 std::unique_ptr<ForInit> Parser::parseForInit() {
     log("Parsing for-init");
 
-    if (peek().token == Token::INT) {
+    if (peekKind() == Token::INT) {
         // Case: declaration (e.g., int x = 5;)
         advance();  // consume 'int'
         expect(Token::IDENTIFIER, "Expected identifier in for-loop declaration");
@@ -147,7 +152,7 @@ std::unique_ptr<ForInit> Parser::parseForInit() {
         // Case: optional expression (e.g., i = 0;)
         std::unique_ptr<Expression> expr = nullptr;
 
-        if (peek().token != Token::SEMICOLON) {
+        if (peekKind() != Token::SEMICOLON) {
             expr = parseExpression(0);
         }
 
@@ -234,7 +239,7 @@ std::unique_ptr<Statement> Parser::parseStatement() {
         }
 
         std::unique_ptr<Expression> post = nullptr;
-        if (peek().token != Token::CPARENTHESIS) {
+        if (peekKind() != Token::CPARENTHESIS) {
             post = parseExpression(0);
         }
 
@@ -256,7 +261,7 @@ std::unique_ptr<Statement> Parser::parseStatement() {
         return std::make_unique<Statement>(std::move(block));
     }
 
-    if (peek().token == Token::SEMICOLON) {
+    if (peekKind() == Token::SEMICOLON) {
         advance();
         log("Parsed empty statement");
         return std::make_unique<Statement>(nullptr, StatementType::NULL_STMT);
@@ -324,13 +329,14 @@ UnaryOpast Parser::tokenToUnaryOp(Token token) {
 }
 
 std::unique_ptr<Expression> Parser::parseExpression(int minPrecedence) {
-    log("Parsing expression with precedence >= " + std::to_string(minPrecedence));
+    if (verbose) {
+        log("Parsing expression with precedence >= " + std::to_string(minPrecedence));
+    }
 
     std::unique_ptr<Expression> left = parseFactor();
 
     while (true) {
-        Lex opToken = peek();
-        Token op = opToken.token;
+        Token op = peekKind();
 
         // Special handling for conditional operator (ternary ?:)
         if (op == Token::QUESTION_MARK) {
@@ -338,12 +344,12 @@ std::unique_ptr<Expression> Parser::parseExpression(int minPrecedence) {
                 break;
             }
 
-            advance();  // consume '?'
+            const Lex& opToken = advance();  // consume '?'
             log("Parsing true branch of conditional expression");
 
             std::unique_ptr<Expression> trueExpr = parseExpression(1); // higher than ?:
 
-            if (peek().token != Token::COLON) {
+            if (peekKind() != Token::COLON) {
                 error("Expected ':' in conditional expression", peek());
             }
 
@@ -381,17 +387,21 @@ std::unique_ptr<Expression> Parser::parseExpression(int minPrecedence) {
 // Parse factor
 std::unique_ptr<Expression> Parser::parseFactor() {
     log("Parsing factor");
-    Lex currentToken = peek();
+    const Lex& currentToken = peek();
 
     if (currentToken.token == Token::CONSTANT) {
         advance();
         int value = std::stoi(currentToken.word);
-        log("Parsed integer literal: " + std::to_string(value));
+        if (verbose) {
+            log("Parsed integer literal: " + std::to_string(value));
+        }
         return std::make_unique<Expression>(value);
     }
     else if (currentToken.token == Token::IDENTIFIER) {
         advance();
-        log("Parsed identifier: " + currentToken.word);
+        if (verbose) {
+            log("Parsed identifier: " + currentToken.word);
+        }
         return std::make_unique<Expression>(currentToken.word);
     }
     else if (currentToken.token == Token::COMPLEMENT ||
@@ -401,7 +411,9 @@ std::unique_ptr<Expression> Parser::parseFactor() {
         UnaryOpast unop = tokenToUnaryOp(currentToken.token);
         advance();
         std::unique_ptr<Expression> operand = parseFactor();
-        log("Parsed unary operator: " + currentToken.word);
+        if (verbose) {
+            log("Parsed unary operator: " + currentToken.word);
+        }
         return std::make_unique<Expression>(unop, std::move(operand));
     }
     else if (currentToken.token == Token::OPARENTHESIS) {
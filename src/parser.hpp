@@ -24,6 +24,8 @@
 #include <string>
 #include <stdexcept>
 #include <memory>
+#include <initializer_list>
+#include <utility>
 
 #include "lexer.hpp"
 #include "ast.hpp"
@@ -38,9 +40,13 @@
 class Parser {
 private:
     std::vector<Lex> tokens;  /**< List of tokens to parse */
+    std::vector<Token> kinds; /**< Token types laid out contiguously, parallel to tokens */
     size_t current = 0;       /**< Current position in the tokens vector */
     bool verbose;             /**< Verbose mode flag to enable debug logs */
 
+    /** Sentinel returned once the token stream is exhausted */
+    inline static const Lex endOfInput{"", Token::MISMATCH, -1, 0};
+
     /**
      * @brief Throws a runtime error with a detailed parse error message.
      * @param message Description of the parse error.
@@ -55,6 +61,16 @@ private:
      */
     void log(const std::string& message);
 
+    /**
+     * @brief Logs a token being consumed, in verbose mode.
+     *
+     * Kept out of line so the inlined token helpers stay small.
+     *
+     * @param action Prefix describing the action (e.g. "Match token: ").
+     * @param token The token being consumed.
+     */
+    void logToken(const char* action, const Lex& token);
+
     /**
      * @brief Returns the precedence level of a binary operator token.
      *
@@ -112,22 +128,46 @@ public:
 
     /**
      * @brief Returns the current token without consuming it.
-     * @return The current token or a MISMATCH token if at end.
+     * @return Reference to the current token, or to a MISMATCH token if at end.
+     */
+    const Lex& peek() const {
+        return current < tokens.size() ? tokens[current] : endOfInput;
+    }
+
+    /**
+     * @brief Returns the type of the current token without consuming it.
+     *
+     * Lookahead only needs the token type, which is read from the compact
+     * kinds array rather than from the full Lex records.
+     *
+     * @return The current token type, or Token::MISMATCH if at end.
      */
-    Lex peek();
+    Token peekKind() const {
+        return current < kinds.size() ? kinds[current] : Token::MISMATCH;
+    }
 
     /**
      * @brief Consumes and returns the current token.
-     * @return The consumed token or a MISMATCH token if at end.
+     * @return Reference to the consumed token, or to a MISMATCH token if at end.
      */
-    Lex advance();
+    const Lex& advance() {
+        if (current >= tokens.size()) return endOfInput;
+        const Lex& token = tokens[current++];
+        if (verbose) logToken("Advance token: ", token);
+        return token;
+    }
 
     /**
      * @brief Checks if the current token matches the given type and consumes it.
      * @param t Token type to match.
      * @return True if matched and consumed, false otherwise.
      */
-    bool match(Token t);
+    bool match(Token t) {
+        if (current >= kinds.size() || kinds[current] != t) return false;
+        if (verbose) logToken("Match token: ", tokens[current]);
+        advance();
+        return true;
+    }
 
     /**
      * @brief Parses a ‹program› according to the grammar.
@@ -228,10 +268,23 @@ public:
      *
      * @param expected The expected token type.
      * @param errorMsg The error message to display if the token does not match.
-     * @return The consumed token.
+     * @return Reference to the consumed token.
      * @throws std::runtime_error If the current token is not of the expected type.
      */
-    Lex expect(Token expected, const std::string& errorMsg);
+    const Lex& expect(Token expected, const char* errorMsg);
+
+    /**
+     * @brief Consumes a fixed run of tokens, checking all their types at once.
+     *
+     * Equivalent to calling expect() for each entry in turn, but the token types are
+     * compared against the kinds array in a single pass and the cursor is advanced
+     * once. On a mismatch, the error message of the first failing entry is reported.
+     *
+     * @param expected Expected token types, each paired with its error message.
+     * @return Index of the first consumed token.
+     * @throws std::runtime_error If any token is not of the expected type.
+     */
+    size_t expectSequence(std::initializer_list<std::pair<Token, const char*>> expected);
 };
 
 #endif // PARSER_HPP
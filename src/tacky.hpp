@@ -7,10 +7,21 @@
 
 namespace tacky {
 
+/**
+ * @brief Concrete kind of a TACKY value, used for switch-based dispatch.
+ */
+enum class ValKind {
+    Constant,
+    Var
+};
+
 /**
  * @brief Base class for all value types in the TACKY IR.
  */
 struct Val {
+    const ValKind kind;  ///< Concrete type of this value
+
+    explicit Val(ValKind k) : kind(k) {}
     virtual ~Val() = default;
 
     /**
@@ -30,7 +41,7 @@ struct Constant : Val {
      * @brief Constructs a Constant value.
      * @param v The integer constant.
      */
-    Constant(int v) : value(v) {}
+    Constant(int v) : Val(ValKind::Constant), value(v) {}
 
     std::string toString() const override;
 };
@@ -45,7 +56,7 @@ struct Var : Val {
      * @brief Constructs a Var with a given identifier.
      * @param id The name of the variable.
      */
-    Var(const std::string& id) : name(id) {}
+    Var(const std::string& id) : Val(ValKind::Var), name(id) {}
 
     std::string toString() const override;
 };
@@ -78,10 +89,27 @@ enum class BinaryOp {
     OR
 };
 
+/**
+ * @brief Concrete kind of a TACKY instruction, used for switch-based dispatch.
+ */
+enum class InstructionKind {
+    Return,
+    Unary,
+    Binary,
+    Copy,
+    Jump,
+    JumpIfZero,
+    JumpIfNotZero,
+    Label
+};
+
 /**
  * @brief Base class for all instructions in TACKY IR.
  */
 struct Instruction {
+    const InstructionKind kind;  ///< Concrete type of this instruction
+
+    explicit Instruction(InstructionKind k) : kind(k) {}
     virtual ~Instruction() = default;
 
     /**
@@ -101,7 +129,7 @@ struct Return : Instruction {
      * @brief Constructs a Return instruction.
      * @param v The value to return.
      */
-    Return(std::unique_ptr<Val> v) : value(std::move(v)) {}
+    Return(std::unique_ptr<Val> v) : Instruction(InstructionKind::Return), value(std::move(v)) {}
 
     std::string toString() const override;
 };
@@ -121,7 +149,7 @@ struct Unary : Instruction {
      * @param d The destination variable.
      */
     Unary(UnaryOp o, std::unique_ptr<Val> s, std::unique_ptr<Val> d)
-        : op(o), src(std::move(s)), dst(std::move(d)) {}
+        : Instruction(InstructionKind::Unary), op(o), src(std::move(s)), dst(std::move(d)) {}
 
     std::string toString() const override;
 };
@@ -143,7 +171,7 @@ struct Binary : Instruction {
      * @param d The destination variable.
      */
     Binary(BinaryOp o, std::unique_ptr<Val> s1, std::unique_ptr<Val> s2, std::unique_ptr<Val> d) 
-        : op(o), src1(std::move(s1)), src2(std::move(s2)), dst(std::move(d)) {}
+        : Instruction(InstructionKind::Binary), op(o), src1(std::move(s1)), src2(std::move(s2)), dst(std::move(d)) {}
 
     std::string toString() const override;
 };
@@ -158,7 +186,7 @@ struct Copy : Instruction {
      * @param d The destination variable
      */
     Copy(std::unique_ptr<Val> s, std::unique_ptr<Val> d) 
-        : src(std::move(s)), dst(std::move(d)) {}
+        : Instruction(InstructionKind::Copy), src(std::move(s)), dst(std::move(d)) {}
     
     std::string toString() const override;
 };
@@ -171,7 +199,7 @@ struct Jump : Instruction {
      * @param t name of the target
      */
     Jump(std::string t) 
-        : target(t) {}
+        : Instruction(InstructionKind::Jump), target(t) {}
     
     std::string toString() const override;
 };
@@ -181,7 +209,7 @@ struct JumpIfZero : Instruction {
     std::string target;
 
     JumpIfZero(std::unique_ptr<Val> c, std::string t)
-        : condition(std::move(c)), target(t) {}
+        : Instruction(InstructionKind::JumpIfZero), condition(std::move(c)), target(t) {}
     
     std::string toString() const override;
 };
@@ -191,7 +219,7 @@ struct JumpIfNotZero : Instruction {
     std::string target;
 
     JumpIfNotZero(std::unique_ptr<Val> c, std::string t)
-        : condition(std::move(c)), target(t) {}
+        : Instruction(InstructionKind::JumpIfNotZero), condition(std::move(c)), target(t) {}
     
     std::string toString() const override;
 };
@@ -199,7 +227,7 @@ struct JumpIfNotZero : Instruction {
 struct Label : Instruction {
     std::string name;
 
-    Label(const std::string& n) : name(n) {}
+    Label(const std::string& n) : Instruction(InstructionKind::Label), name(n) {}
 
     std::string toString() const override;
 };